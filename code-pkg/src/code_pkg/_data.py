@@ -1,5 +1,5 @@
 import dataclasses as dc
-from typing import TYPE_CHECKING, Literal, NamedTuple, TypedDict
+from typing import TYPE_CHECKING, Literal, NamedTuple, NotRequired, TypedDict
 
 if TYPE_CHECKING:
     from collections.abc import Mapping, Sequence
@@ -87,6 +87,33 @@ class IsotropicExponentialMaterial(TypedDict, total=True):
 type MaterialDef = NeoHookeanMaterial | IsotropicExponentialMaterial
 
 
+class DiscretisationDef(TypedDict, total=True):
+    gp: int
+    pressure_order: Literal[0, 1]
+
+
+type MatrixCalculation = Literal["EVALUATE_EVERY_BUILD", "EVALUATE_ONCE"]
+
+
+class SolverDef(TypedDict, total=False):
+    matrix_calculation: MatrixCalculation
+    ale_calculation: MatrixCalculation
+    method: Literal["seq_fp_linesearch", "seq_fp"]
+    ale_first: bool
+    subiterations: int
+    subiter_fraction: float
+    l2tol: float
+    scale_first_residual: float
+
+
+type IOProfile = Literal["traces-only", "fields-every-50", "full-binary"]
+
+
+class IODef(TypedDict, total=True):
+    fmt: Literal["TXT", "BINARY"]
+    freq: int
+
+
 class ProblemDef(TypedDict, total=True):
     prefix: str
     output_dir: Path
@@ -94,6 +121,24 @@ class ProblemDef(TypedDict, total=True):
     mesh: TopDef
     loading: LoadingDef
     material: MaterialDef
+    io: NotRequired[IOProfile]
+    discretisation: NotRequired[DiscretisationDef]
+    solver: NotRequired[SolverDef]
+
+
+type SweepValue = int | float | str
+
+
+class SweepDef(TypedDict, total=True):
+    base: ProblemDef
+    prefix: str
+    axes: Sequence[Mapping[str, Sequence[SweepValue]]]
+    fields: NotRequired[Mapping[str, str]]
+
+
+class RestartPoint(NamedTuple):
+    home: Path
+    step: int
 
 
 @dc.dataclass(slots=True, frozen=True)
@@ -107,6 +152,7 @@ class ProblemTopology:
     inlet: ICheartTopology
     apex: ICheartTopology
     bnd: ICheartTopology
+    fluid_pressure: ICheartTopology
 
 
 class FluidVariables(NamedTuple):
@@ -0,0 +1,39 @@
+from ._metrics import (
+    METRICS,
+    TraceStack,
+    decay_rate,
+    dominant_frequency,
+    hold_window,
+    oscillation_metrics,
+    peak_to_peak,
+    rms_error,
+    stack_traces,
+    sweep_metrics,
+)
+from ._surrogate import (
+    FEATURES,
+    GaussianProcess,
+    PressureSurrogate,
+    SurrogatePrediction,
+    fit_surrogate,
+    surrogate_features,
+)
+
+__all__ = [
+    "FEATURES",
+    "METRICS",
+    "GaussianProcess",
+    "PressureSurrogate",
+    "SurrogatePrediction",
+    "TraceStack",
+    "decay_rate",
+    "dominant_frequency",
+    "fit_surrogate",
+    "hold_window",
+    "oscillation_metrics",
+    "peak_to_peak",
+    "rms_error",
+    "stack_traces",
+    "surrogate_features",
+    "sweep_metrics",
+]
@@ -0,0 +1,257 @@
+import warnings
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from pytools.result import Err, Ok, Result
+
+from code_pkg.components.bc import calc_bc_duration
+from code_pkg.io import params_table, read_pressure_columns, sweep_params
+from code_pkg.plotting import REFERENCE_TAG, is_reference
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping, Sequence
+
+    from numpy.typing import NDArray
+
+    from code_pkg.io import SweepParams, SweepStore
+    from code_pkg.types import LoadingDef, ProblemDef
+
+METRICS = ("peak_to_peak", "dominant_frequency", "hold_decay_rate", "rms_error")
+_MIN_SAMPLES = 3
+
+
+class TraceStack(NamedTuple):
+    """Inlet - apex pressure of several runs, padded with NaN to the longest run."""
+
+    prefixes: list[str]
+    time: NDArray[np.float64]
+    dp: NDArray[np.float64]
+    dt: NDArray[np.float64]
+    lengths: NDArray[np.intp]
+
+
+def stack_traces(columns: Mapping[str, NDArray[np.float64]]) -> TraceStack:
+    """Stack (n, 3) time, apex and inlet columns of runs into 2D arrays.
+
+    Returns
+    -------
+    TraceStack
+        One row per run, in the order of `columns`.
+
+    """
+    lengths = np.array([len(c) for c in columns.values()], dtype=np.intp)
+    width = int(lengths.max(initial=0))
+    time = np.full((len(columns), width), np.nan)
+    dp = np.full((len(columns), width), np.nan)
+    for i, c in enumerate(columns.values()):
+        time[i, : len(c)] = c[:, 0]
+        dp[i, : len(c)] = c[:, 2] - c[:, 1]
+    dt = time[:, 1] - time[:, 0] if width > 1 else np.full(len(lengths), np.nan)
+    return TraceStack(list(columns), time, dp, dt, lengths)
+
+
+def _window_mask(stack: TraceStack, windows: NDArray[np.float64]) -> NDArray[np.bool_]:
+    lo, hi = windows[:, :1], windows[:, 1:]
+    return (stack.time >= lo) & (stack.time <= hi)
+
+
+def peak_to_peak(
+    stack: TraceStack, windows: NDArray[np.float64] | None = None
+) -> NDArray[np.float64]:
+    dp = stack.dp if windows is None else np.where(_window_mask(stack, windows), stack.dp, np.nan)
+    return np.nanmax(dp, axis=1, initial=-np.inf) - np.nanmin(dp, axis=1, initial=np.inf)
+
+
+def dominant_frequency(stack: TraceStack) -> NDArray[np.float64]:
+    """Frequency of the largest non-zero FFT bin of each mean-free, zero-padded trace.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Frequency in 1/[time], NaN for runs with fewer than 3 samples.
+
+    """
+    mean = np.nanmean(stack.dp, axis=1, keepdims=True)
+    signal = np.nan_to_num(stack.dp - mean, nan=0.0)
+    n = signal.shape[1]
+    spectrum = np.abs(np.fft.rfft(signal * np.hanning(n), axis=1))
+    k = np.argmax(spectrum[:, 1:], axis=1) + 1
+    freq = k / (n * stack.dt)
+    return np.where(stack.lengths >= _MIN_SAMPLES, freq, np.nan)
+
+
+def _covered(stack: TraceStack, windows: NDArray[np.float64]) -> NDArray[np.float64]:
+    # windows clipped to the time each run covers, e.g. a Hold past the end of the run
+    if stack.time.shape[1] == 0:
+        return np.full_like(windows, np.nan)
+    last = stack.time[np.arange(len(stack.lengths)), np.maximum(stack.lengths - 1, 0)]
+    return np.column_stack([
+        np.maximum(windows[:, 0], stack.time[:, 0]),
+        np.minimum(windows[:, 1], last),
+    ])
+
+
+def decay_rate(stack: TraceStack, windows: NDArray[np.float64]) -> NDArray[np.float64]:
+    """Logarithmic decay rate of the oscillation within `windows`.
+
+    Each window is first clipped to the time its run covers. The rate is estimated from the
+    RMS about the window mean of the first and second half of the clipped window,
+    `ln(rms_1 / rms_2) / (t_2 - t_1)`, which is exact for an exponentially damped oscillation
+    sampled over whole periods.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Decay rate in 1/[time], NaN where the clipped window has fewer than 6 samples or the
+        halves have no oscillation.
+
+    """
+    windows = _covered(stack, windows)
+    mask = _window_mask(stack, windows)
+    mid = windows.mean(axis=1, keepdims=True)
+    first, second = mask & (stack.time < mid), mask & (stack.time >= mid)
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        # runs with an empty window are all-NaN slices, reported as NaN below
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean = np.nanmean(np.where(mask, stack.dp, np.nan), axis=1, keepdims=True)
+        centered = stack.dp - mean
+        rms1 = np.sqrt(np.nanmean(np.where(first, centered**2, np.nan), axis=1))
+        rms2 = np.sqrt(np.nanmean(np.where(second, centered**2, np.nan), axis=1))
+        t1 = np.nanmean(np.where(first, stack.time, np.nan), axis=1)
+        t2 = np.nanmean(np.where(second, stack.time, np.nan), axis=1)
+        rate = np.log(rms1 / rms2) / (t2 - t1)
+    return np.where(mask.sum(axis=1) >= 2 * _MIN_SAMPLES, rate, np.nan)
+
+
+def rms_error(stack: TraceStack, reference: NDArray[np.float64]) -> NDArray[np.float64]:
+    """RMS of the difference to `reference` (n, 3) time, apex, inlet columns.
+
+    Runs on the time grid of the reference are compared directly, others after linear
+    interpolation of the reference onto their grid.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        One value per run.
+
+    """
+    ref_t, ref_dp = reference[:, 0], reference[:, 2] - reference[:, 1]
+    width = stack.time.shape[1]
+    ref = np.full(width, np.nan)
+    ref[: min(width, len(ref_t))] = ref_dp[:width]
+    same = (stack.lengths == len(ref_t)) & np.isclose(stack.dt, ref_t[1] - ref_t[0])
+    diff = stack.dp - ref
+    for i in np.flatnonzero(~same):
+        n = stack.lengths[i]
+        diff[i, :n] = stack.dp[i, :n] - np.interp(stack.time[i, :n], ref_t, ref_dp)
+    with np.errstate(invalid="ignore"):
+        return np.sqrt(np.nanmean(diff**2, axis=1))
+
+
+def hold_window(loading: LoadingDef) -> tuple[float, float]:
+    """Start and end time of the first Hold phase of a loading, (nan, nan) if there is none.
+
+    Returns
+    -------
+    tuple[float, float]
+        Time window of the hold phase.
+
+    """
+    start = 0.0
+    for curve in loading["time"]:
+        duration = calc_bc_duration(curve)
+        if curve["type"] == "Hold":
+            return start, start + duration
+        start += duration
+    return float("nan"), float("nan")
+
+
+class _GroupMetrics(NamedTuple):
+    params: list[SweepParams]
+    metrics: dict[str, NDArray[np.float64]]
+
+
+def _group_metrics(probs: Sequence[ProblemDef], store: SweepStore | None) -> Result[_GroupMetrics]:
+    columns: dict[str, NDArray[np.float64]] = {}
+    loaded: list[ProblemDef] = []
+    for p in probs:
+        match read_pressure_columns(p) if store is None else store.read(p["prefix"]):
+            case Ok(c):
+                columns[p["prefix"]] = c
+                loaded.append(p)
+            case Err(e):
+                print(f"Failed to import {p['prefix']}: {e}")
+    refs = [k for k in columns if is_reference(k)]
+    if len(refs) != 1:
+        msg = f"Expected exactly one reference response with '{REFERENCE_TAG}'"
+        return Err(ValueError(f"{msg}, found {len(refs)}."))
+    stack = stack_traces(columns)
+    windows = np.array([hold_window(p["loading"]) for p in loaded]).reshape(-1, 2)
+    metrics = {
+        "peak_to_peak": peak_to_peak(stack),
+        "dominant_frequency": dominant_frequency(stack),
+        "hold_decay_rate": decay_rate(stack, windows),
+        "rms_error": rms_error(stack, columns[refs[0]]),
+    }
+    params = [sweep_params(p, int(n)) for p, n in zip(loaded, stack.lengths, strict=True)]
+    return Ok(_GroupMetrics(params, metrics))
+
+
+def _metrics_table(groups: Sequence[_GroupMetrics]) -> NDArray[np.void]:
+    params = params_table([p for g in groups for p in g.params])
+    dtype = np.dtype(params.dtype.descr + [(k, "f8") for k in METRICS])
+    table = np.empty(len(params), dtype=dtype)
+    for k in params.dtype.names or ():
+        table[k] = params[k]
+    for k in METRICS:
+        table[k] = np.concatenate([g.metrics[k] for g in groups]) if groups else []
+    return table
+
+
+def oscillation_metrics(
+    probs: Sequence[ProblemDef], *, store: SweepStore | None = None
+) -> Result[NDArray[np.void]]:
+    """Compute the oscillation metrics of a group of runs sharing one reference run.
+
+    Parameters
+    ----------
+    probs: Sequence[ProblemDef]
+        Runs of the group, exactly one of which is the reference (see `is_reference`).
+    store: SweepStore | None
+        Read traces from this store instead of the run directories.
+
+    Returns
+    -------
+    Result[NDArray[np.void]]
+        Structured array with one row per run that could be read, holding the columns of
+        `code_pkg.io.params_table` followed by those named in `METRICS`.
+
+    """
+    match _group_metrics(probs, store):
+        case Ok(group):
+            return Ok(_metrics_table([group]))
+        case Err(e):
+            return Err(e)
+
+
+def sweep_metrics(
+    groups: Iterable[Sequence[ProblemDef]], *, store: SweepStore | None = None
+) -> NDArray[np.void]:
+    """Compute `oscillation_metrics` of every group of a sweep into one table.
+
+    Groups without exactly one reference run are reported and left out.
+
+    Returns
+    -------
+    NDArray[np.void]
+        The metrics table of the sweep.
+
+    """
+    results: list[_GroupMetrics] = []
+    for group in groups:
+        match _group_metrics(group, store):
+            case Ok(g):
+                results.append(g)
+            case Err(e):
+                print(e)
+    return _metrics_table(results)
@@ -0,0 +1,293 @@
+import itertools
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from pytools.result import Err, Ok, Result
+
+from code_pkg.io import read_pressure_columns, sweep_params
+from code_pkg.plotting import PressureData
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+    from numpy.typing import NDArray
+
+    from code_pkg.io import SweepStore
+    from code_pkg.types import ProblemDef
+
+FEATURES = ("log_stiffness", "width", "frequency")
+_MIN_RUNS = 3
+_ENERGY = 0.9999
+_NUGGET = 1.0e-8
+# candidate length scales of the kernel in coordinates scaled to the unit box
+_LENGTH_SCALES = (0.15, 0.3, 0.6, 1.2, 2.4)
+
+
+def surrogate_features(prob: ProblemDef) -> NDArray[np.float64]:
+    """Return the parameters a surrogate interpolates over, in the order of `FEATURES`.
+
+    Returns
+    -------
+    NDArray[np.float64]
+        Log stiffness, jet width and loading frequency; NaN frequency without a Sine curve.
+
+    """
+    p = sweep_params(prob, 0)
+    return np.array([np.log(p.stiffness), p.width, p.frequency])
+
+
+def _kernel(
+    a: NDArray[np.float64], b: NDArray[np.float64], scale: NDArray[np.float64]
+) -> NDArray[np.float64]:
+    d = (a[:, None, :] - b[None, :, :]) / scale
+    return np.exp(-0.5 * np.einsum("ijk,ijk->ij", d, d))
+
+
+def _condition(
+    x: NDArray[np.float64], y: NDArray[np.float64], scale: NDArray[np.float64]
+) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+    chol = np.linalg.cholesky(_kernel(x, x, scale) + _NUGGET * np.eye(len(x)))
+    return chol, np.linalg.solve(chol.T, np.linalg.solve(chol, y))
+
+
+class GaussianProcess(NamedTuple):
+    """Gaussian process with a squared exponential kernel shared by every output."""
+
+    x: NDArray[np.float64]
+    y: NDArray[np.float64]
+    scale: NDArray[np.float64]
+    chol: NDArray[np.float64]
+    alpha: NDArray[np.float64]
+    variance: NDArray[np.float64]
+
+    @classmethod
+    def fit(cls, x: NDArray[np.float64], y: NDArray[np.float64]) -> GaussianProcess:
+        """Condition a process on `y` with the length scales of highest likelihood.
+
+        Length scales are searched on a grid, with the variance of each output profiled out.
+
+        Parameters
+        ----------
+        x: NDArray[np.float64]
+            (m, d) inputs, scaled to about the unit box.
+        y: NDArray[np.float64]
+            (m, r) outputs, one column per output.
+
+        Returns
+        -------
+        GaussianProcess
+
+        Raises
+        ------
+        LinAlgError
+            If the kernel matrix is singular for every candidate.
+
+        """
+        m = len(x)
+        best: tuple[float, GaussianProcess] | None = None
+        for candidate in itertools.product(_LENGTH_SCALES, repeat=x.shape[1]):
+            scale = np.array(candidate)
+            try:
+                chol, alpha = _condition(x, y, scale)
+            except np.linalg.LinAlgError:
+                continue
+            variance = np.maximum(np.einsum("ij,ij->j", y, alpha) / m, np.finfo(float).tiny)
+            nll = 0.5 * m * np.log(variance).sum() + y.shape[1] * np.log(np.diag(chol)).sum()
+            if best is None or nll < best[0]:
+                best = (nll, cls(x, y, scale, chol, alpha, variance))
+        if best is None:
+            msg = "Kernel matrix is singular for every length scale"
+            raise np.linalg.LinAlgError(msg)
+        return best[1]
+
+    def predict(self, x: NDArray[np.float64]) -> tuple[NDArray[np.float64], NDArray[np.float64]]:
+        """Return the (k, r) mean and variance of the outputs at (k, d) inputs `x`.
+
+        Returns
+        -------
+        tuple[NDArray[np.float64], NDArray[np.float64]]
+
+        """
+        ks = _kernel(x, self.x, self.scale)
+        v = np.linalg.solve(self.chol, ks.T)
+        reduction = np.maximum(1.0 - np.einsum("ij,ij->j", v, v), 0.0)
+        return ks @ self.alpha, reduction[:, None] * self.variance
+
+    def extend(self, x: NDArray[np.float64]) -> GaussianProcess:
+        """Add inputs `x` with outputs at their predicted mean, keeping the hyperparameters.
+
+        The mean is unchanged while the variance near `x` drops, as if they had been observed.
+
+        Returns
+        -------
+        GaussianProcess
+
+        """
+        xs, ys = np.vstack([self.x, x]), np.vstack([self.y, self.predict(x)[0]])
+        chol, alpha = _condition(xs, ys, self.scale)
+        return self._replace(x=xs, y=ys, chol=chol, alpha=alpha)
+
+
+class SurrogatePrediction(NamedTuple):
+    mean: PressureData[np.float64]
+    std: PressureData[np.float64]
+    dp_std: NDArray[np.float64]
+
+
+class PressureSurrogate:
+    """Predict the apex and inlet pressure of unseen problems from completed runs.
+
+    The traces of the training runs are reduced to a POD basis holding `energy` of their
+    variance about the mean; the coefficients are interpolated over `FEATURES`, scaled to the
+    unit box of the training runs, by a Gaussian process. The standard deviation of a
+    prediction combines the process variance with the residual of the truncated basis.
+    """
+
+    __slots__ = ("_gp", "_lo", "_mean", "_modes", "_residual", "_span", "prefixes", "time")
+
+    def __init__(
+        self,
+        prefixes: list[str],
+        features: NDArray[np.float64],
+        traces: NDArray[np.float64],
+        time: NDArray[np.float64],
+        *,
+        energy: float = _ENERGY,
+    ) -> None:
+        self.prefixes = prefixes
+        self.time = time
+        self._lo = features.min(axis=0)
+        span = features.max(axis=0) - self._lo
+        self._span = np.where(span > 0, span, 1.0)
+        self._mean = traces.mean(axis=0)
+        u, s, vt = np.linalg.svd(traces - self._mean, full_matrices=False)
+        captured = np.cumsum(s**2) / max(float(np.sum(s**2)), np.finfo(float).tiny)
+        rank = int(np.searchsorted(captured, energy) + 1)
+        self._modes = vt[:rank]
+        coef = u[:, :rank] * s[:rank]
+        fitted = coef @ self._modes
+        self._residual = np.sqrt(np.mean((traces - self._mean - fitted) ** 2, axis=0))
+        self._gp = GaussianProcess.fit(self._scaled(features), coef)
+
+    def _scaled(self, features: NDArray[np.float64]) -> NDArray[np.float64]:
+        return (features - self._lo) / self._span
+
+    @property
+    def rank(self) -> int:
+        return len(self._modes)
+
+    def _split(self, v: NDArray[np.float64]) -> PressureData[np.float64]:
+        n = len(self.time)
+        return PressureData(self.time, v[..., :n], v[..., n:])
+
+    def predict_features(self, features: NDArray[np.float64]) -> SurrogatePrediction:
+        """Predict the traces at a point given by its `FEATURES`.
+
+        Returns
+        -------
+        SurrogatePrediction
+            Mean and standard deviation of the apex and inlet traces, and the standard
+            deviation of inlet - apex.
+
+        """
+        n = len(self.time)
+        coef, coef_var = self._gp.predict(self._scaled(features)[None, :])
+        var = coef_var[0]
+        mean = self._mean + coef[0] @ self._modes
+        std = np.sqrt(var @ self._modes**2 + self._residual**2)
+        dp_modes = self._modes[:, n:] - self._modes[:, :n]
+        dp_residual = self._residual[n:] ** 2 + self._residual[:n] ** 2
+        dp_std = np.sqrt(var @ dp_modes**2 + dp_residual)
+        return SurrogatePrediction(self._split(mean), self._split(std), dp_std)
+
+    def predict(self, prob: ProblemDef) -> SurrogatePrediction:
+        """Predict the traces of `prob`, see `predict_features`.
+
+        Returns
+        -------
+        SurrogatePrediction
+
+        """
+        return self.predict_features(surrogate_features(prob))
+
+    def loo_error(self) -> dict[str, float]:
+        """Leave-one-out RMS error of inlet - apex of every training run.
+
+        Computed in closed form from the conditioned process, without refitting the basis.
+
+        Returns
+        -------
+        dict[str, float]
+            RMS over time of the error predicting each run from all others.
+
+        """
+        gp, n = self._gp, len(self.time)
+        inv = np.linalg.solve(gp.chol.T, np.linalg.solve(gp.chol, np.eye(len(gp.x))))
+        coef_err = gp.alpha / np.diag(inv)[:, None]
+        dp_err = coef_err @ (self._modes[:, n:] - self._modes[:, :n])
+        rms = np.sqrt(np.mean(dp_err**2, axis=1))
+        return dict(zip(self.prefixes, rms.tolist(), strict=True))
+
+
+def _unusable(features: NDArray[np.float64], columns: NDArray[np.float64]) -> str | None:
+    if not np.all(np.isfinite(features)):
+        return f"features {dict(zip(FEATURES, features, strict=True))}"
+    if not np.all(np.isfinite(columns)):
+        return "pressure trace is not finite"
+    return None
+
+
+def fit_surrogate(
+    probs: Iterable[ProblemDef], *, store: SweepStore | None = None, energy: float = _ENERGY
+) -> Result[PressureSurrogate]:
+    """Train a `PressureSurrogate` on the runs of `probs` that completed.
+
+    Parameters
+    ----------
+    probs: Iterable[ProblemDef]
+        Candidate training runs; those that cannot be read or hold non-finite features or
+        traces, e.g. diverged runs, are reported and left out.
+    store: SweepStore | None
+        Read traces from this store instead of the run directories.
+    energy: float
+        Fraction of the trace variance kept by the POD basis.
+
+    Returns
+    -------
+    Result[PressureSurrogate]
+        Err unless at least 3 runs of one material share a time grid and have finite features.
+
+    """
+    prefixes: list[str] = []
+    features: list[NDArray[np.float64]] = []
+    traces: list[NDArray[np.float64]] = []
+    time: NDArray[np.float64] | None = None
+    materials: set[str] = set()
+    for p in probs:
+        match read_pressure_columns(p) if store is None else store.read(p["prefix"]):
+            case Ok(c): ...  # fmt: skip
+            case Err(e):
+                print(f"Failed to import {p['prefix']}: {e}")
+                continue
+        if (reason := _unusable(x := surrogate_features(p), c)) is not None:
+            print(f"Skipping {p['prefix']}: {reason}")
+            continue
+        if time is None:
+            time = c[:, 0]
+        elif len(c) != len(time) or not np.allclose(c[:, 0], time):
+            return Err(ValueError(f"Time grid of {p['prefix']} differs from the first run"))
+        materials.add(p["material"]["type"])
+        prefixes.append(p["prefix"])
+        features.append(x)
+        traces.append(np.concatenate([c[:, 1], c[:, 2]]))
+    if len(materials) > 1:
+        return Err(ValueError(f"Training runs mix materials {sorted(materials)}"))
+    if time is None or len(prefixes) < _MIN_RUNS:
+        return Err(ValueError(f"Need {_MIN_RUNS} completed runs, found {len(prefixes)}"))
+    try:
+        model = PressureSurrogate(
+            prefixes, np.array(features), np.array(traces), time, energy=energy
+        )
+    except np.linalg.LinAlgError as e:
+        return Err(e)
+    return Ok(model)
@@ -1,3 +1,89 @@
-from ._api import run
+from ._adaptive import ADAPTIVE_METRICS, AdaptiveReport, AdaptiveRound, adaptive_sweep
+from ._api import RunResult, run
+from ._benchmark import (
+    SOLVER_CHOICES,
+    DiscretisationCase,
+    DiscretisationReport,
+    SolverCase,
+    SolverReport,
+    autotune_solver,
+    benchmark_discretisation,
+    discretisation_grid,
+)
+from ._jobs import JobRow, JobStore, RetryPolicy, run_sweep
+from ._logs import (
+    CHEART_PATTERNS,
+    LogMonitor,
+    LogPatterns,
+    PrepSummary,
+    Progress,
+    RunLog,
+    StepRecord,
+    SweepProgress,
+    read_prep_log,
+    read_step_records,
+)
+from ._manifest import CompletionManifest, probe_trace, sweep_status
+from ._prep import ensure_prep, prep_key
+from ._restart import find_checkpoint, merge_traces, prepare_restart
+from ._results import (
+    RESULT_KEY,
+    ResultCache,
+    neutral_problem,
+    normalise_def,
+    read_result_key,
+    result_key,
+)
+from ._scheduler import CoreScheduler, JobRecord, UtilisationReport
+from ._watchdog import Watchdog, WatchdogDef, run_problem_watched
 
-__all__ = ["run"]
+__all__ = [
+    "ADAPTIVE_METRICS",
+    "CHEART_PATTERNS",
+    "RESULT_KEY",
+    "SOLVER_CHOICES",
+    "AdaptiveReport",
+    "AdaptiveRound",
+    "CompletionManifest",
+    "CoreScheduler",
+    "DiscretisationCase",
+    "DiscretisationReport",
+    "JobRecord",
+    "JobRow",
+    "JobStore",
+    "LogMonitor",
+    "LogPatterns",
+    "PrepSummary",
+    "Progress",
+    "ResultCache",
+    "RetryPolicy",
+    "RunLog",
+    "RunResult",
+    "SolverCase",
+    "SolverReport",
+    "StepRecord",
+    "SweepProgress",
+    "UtilisationReport",
+    "Watchdog",
+    "WatchdogDef",
+    "adaptive_sweep",
+    "autotune_solver",
+    "benchmark_discretisation",
+    "discretisation_grid",
+    "ensure_prep",
+    "find_checkpoint",
+    "merge_traces",
+    "neutral_problem",
+    "normalise_def",
+    "prep_key",
+    "prepare_restart",
+    "probe_trace",
+    "read_prep_log",
+    "read_result_key",
+    "read_step_records",
+    "result_key",
+    "run",
+    "run_problem_watched",
+    "run_sweep",
+    "sweep_status",
+]
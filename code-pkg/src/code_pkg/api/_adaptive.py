@@ -0,0 +1,282 @@
+from typing import TYPE_CHECKING, NamedTuple, Unpack
+
+import numpy as np
+from pytools.result import Err, Ok
+
+from code_pkg.analysis import (
+    GaussianProcess,
+    decay_rate,
+    dominant_frequency,
+    hold_window,
+    peak_to_peak,
+    stack_traces,
+    surrogate_features,
+)
+from code_pkg.io import read_pressure_columns
+
+from ._jobs import run_sweep
+from ._manifest import sweep_status
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    from numpy.typing import NDArray
+
+    from code_pkg.types import ProblemDef
+
+    from ._api import MainKwargs
+    from ._jobs import JobStore
+    from ._scheduler import CoreScheduler
+
+ADAPTIVE_METRICS = ("peak_to_peak", "dominant_frequency", "hold_decay_rate")
+_MIN_TRAINED = 2
+
+
+class AdaptiveRound(NamedTuple):
+    trained: int
+    max_std: float
+    submitted: list[str]
+
+
+class AdaptiveReport(NamedTuple):
+    rounds: list[AdaptiveRound]
+    runs: list[str]
+    converged: bool
+
+    def __str__(self) -> str:
+        lines = [
+            f"round {i}: {r.trained} runs, max std {r.max_std:.3g}, +{len(r.submitted)}"
+            for i, r in enumerate(self.rounds)
+        ]
+        state = "converged" if self.converged else "stopped before converging"
+        lines.append(f"{state} with {len(self.runs)} runs")
+        return "\n".join(lines)
+
+
+def _metrics(probs: Sequence[ProblemDef]) -> tuple[list[int], NDArray[np.float64]]:
+    """Return the indices of the readable runs and their metrics in `ADAPTIVE_METRICS` order.
+
+    Returns
+    -------
+    tuple[list[int], NDArray[np.float64]]
+        Indices into `probs` and the (m, 3) metrics of those runs.
+
+    """
+    columns: dict[str, NDArray[np.float64]] = {}
+    loaded: list[int] = []
+    for i, p in enumerate(probs):
+        match read_pressure_columns(p):
+            case Ok(c):
+                columns[p["prefix"]] = c
+                loaded.append(i)
+            case Err(e):
+                print(f"Failed to import {p['prefix']}: {e}")
+    stack = stack_traces(columns)
+    windows = np.array([hold_window(probs[i]["loading"]) for i in loaded]).reshape(-1, 2)
+    metrics = [peak_to_peak(stack), dominant_frequency(stack), decay_rate(stack, windows)]
+    return loaded, np.column_stack(metrics) if loaded else np.empty((0, len(metrics)))
+
+
+def _farthest_points(x: NDArray[np.float64], chosen: list[int], n: int) -> list[int]:
+    """Add `n` points of `x` that are each farthest from all chosen so far.
+
+    Returns
+    -------
+    list[int]
+        Indices of the new points; the point nearest the centroid comes first if none is chosen.
+
+    """
+    if not chosen:
+        chosen = [int(np.argmin(np.sum((x - x.mean(axis=0)) ** 2, axis=1)))]
+        n, picked = n - 1, chosen[:]
+    else:
+        picked = []
+    dist = np.min(np.sum((x[:, None, :] - x[None, chosen, :]) ** 2, axis=2), axis=1)
+    for _ in range(min(n, len(x) - len(chosen))):
+        i = int(np.argmax(dist))
+        picked.append(i)
+        dist = np.minimum(dist, np.sum((x - x[i]) ** 2, axis=1))
+    return picked
+
+
+def _fit_metric(
+    x: NDArray[np.float64], runs: NDArray[np.int_], y: NDArray[np.float64], unknown: list[int]
+) -> GaussianProcess | None:
+    """Fit one metric of `runs`, standardised, then condition it on the `unknown` points.
+
+    Returns
+    -------
+    GaussianProcess | None
+        None if fewer than two runs are given or the metric does not vary between them.
+
+    """
+    if len(runs) < _MIN_TRAINED or not (spread := float(np.std(y))) > 0:
+        return None
+    gp = GaussianProcess.fit(x[runs], ((y - y.mean()) / spread)[:, None])
+    return gp.extend(x[unknown]) if unknown else gp
+
+
+class _Design:
+    """Candidate points, scaled to the unit box, and which of them were run or failed."""
+
+    __slots__ = ("candidates", "done", "failed", "x")
+
+    def __init__(self, candidates: Sequence[ProblemDef]) -> None:
+        self.candidates = candidates
+        features = np.array([surrogate_features(p) for p in candidates])
+        lo, span = features.min(axis=0), np.ptp(features, axis=0)
+        self.x = (features - lo) / np.where(span > 0, span, 1.0)
+        status = sweep_status(candidates)
+        self.done = [i for i, p in enumerate(candidates) if status[p["prefix"]] == "done"]
+        self.failed: set[int] = set()
+
+    def remaining(self) -> list[int]:
+        done = set(self.done)
+        return [i for i in range(len(self.candidates)) if i not in done and i not in self.failed]
+
+    def fit(self) -> list[GaussianProcess]:
+        """Fit each metric of the completed runs, standardised, over the scaled features.
+
+        A metric is fitted on the runs where it is finite, e.g. the decay rate is undefined for
+        a run without a hold. Done runs that cannot be read or have no finite metric are moved to
+        the failed ones.
+        Every process is then conditioned at its predicted mean on the runs it lacks and on the
+        failed points, so their neighbourhood is not picked again for its uncertainty alone.
+
+        Returns
+        -------
+        list[GaussianProcess]
+            One process per metric that has two finite runs and varies between them.
+
+        """
+        loaded, metrics = _metrics([self.candidates[i] for i in self.done])
+        finite = np.isfinite(metrics)
+        runs = np.array([self.done[i] for i in loaded], dtype=int)
+        kept = set(runs[finite.any(axis=1)].tolist())
+        self.failed.update(i for i in self.done if i not in kept)
+        self.done = [i for i in self.done if i in kept]
+        gps: list[GaussianProcess] = []
+        for column, ok in zip(metrics.T, finite.T, strict=True):
+            unknown = sorted(self.failed | (kept - set(runs[ok].tolist())))
+            if (gp := _fit_metric(self.x, runs[ok], column[ok], unknown)) is not None:
+                gps.append(gp)
+        return gps
+
+    def submit(
+        self,
+        picked: list[int],
+        store: JobStore,
+        scheduler: CoreScheduler,
+        *,
+        cores: int,
+        **kwargs: Unpack[MainKwargs],
+    ) -> list[str]:
+        probs = [self.candidates[i] for i in picked]
+        run_sweep(probs, store, scheduler, cores=cores, **kwargs)
+        status = sweep_status(probs)
+        for i, p in zip(picked, probs, strict=True):
+            if status[p["prefix"]] == "done":
+                self.done.append(i)
+            else:
+                self.failed.add(i)
+        return [p["prefix"] for p in probs]
+
+    def runs(self) -> list[str]:
+        return [self.candidates[i]["prefix"] for i in self.done]
+
+
+def _predicted_std(gps: list[GaussianProcess], x: NDArray[np.float64]) -> NDArray[np.float64]:
+    return np.sqrt(np.hstack([gp.predict(x)[1] for gp in gps]).mean(axis=1))
+
+
+def _select(
+    gps: list[GaussianProcess], x: NDArray[np.float64], remaining: list[int], n: int
+) -> list[int]:
+    """Pick `n` remaining points of largest predicted standard deviation.
+
+    Each pick is added to the processes at their predicted mean before the next one is
+    chosen, so a batch spreads out instead of clustering around the most uncertain point.
+
+    Returns
+    -------
+    list[int]
+        Indices of the picked points.
+
+    """
+    picked: list[int] = []
+    for _ in range(min(n, len(remaining))):
+        candidates = [i for i in remaining if i not in picked]
+        best = candidates[int(np.argmax(_predicted_std(gps, x[candidates])))]
+        picked.append(best)
+        gps = [gp.extend(x[[best]]) for gp in gps]
+    return picked
+
+
+def adaptive_sweep(  # noqa: PLR0913
+    candidates: Sequence[ProblemDef],
+    store: JobStore,
+    scheduler: CoreScheduler,
+    *,
+    budget: int,
+    tol: float = 0.05,
+    initial: int | None = None,
+    batch: int = 1,
+    cores: int = 4,
+    **kwargs: Unpack[MainKwargs],
+) -> AdaptiveReport:
+    """Run only the candidates needed to interpolate the oscillation metrics to `tol`.
+
+    Starting from `initial` candidates spread over the parameter space (see
+    `code_pkg.analysis.surrogate_features`), a Gaussian process is fitted to each of the
+    standardised `ADAPTIVE_METRICS` of the completed runs, and the `batch` candidates of
+    largest predicted standard deviation are run next, through `run_sweep`. Candidates
+    completed before, e.g. by an interrupted adaptive sweep, are used without rerunning.
+
+    Parameters
+    ----------
+    candidates: Sequence[ProblemDef]
+        Points that may be run, such as a dense `SweepSpec`.
+    store: JobStore
+        Job database shared by the rounds.
+    scheduler: CoreScheduler
+        Scheduler executing the jobs.
+    budget: int
+        Maximum number of runs submitted, including the initial design.
+    tol: float
+        Stop once no candidate has a predicted standard deviation, in units of the spread of
+        the metrics over the completed runs and averaged in variance over them, above `tol`.
+    initial: int | None
+        Size of the initial design, defaults to 2 * 3 + 1 for the three features.
+    batch: int
+        Runs submitted per round.
+    cores: int
+        Cores per job.
+    kwargs: MainKwargs
+        Forwarded to `run`.
+
+    Returns
+    -------
+    AdaptiveReport
+        Rounds with the largest standard deviation seen, the runs used and whether `tol`
+        was reached.
+
+    """
+    design = _Design(candidates)
+    submitted: list[str] = []
+    rounds: list[AdaptiveRound] = []
+    initial = 2 * design.x.shape[1] + 1 if initial is None else initial
+    if (n := min(initial - len(design.done), budget)) > 0:
+        seed = _farthest_points(design.x, design.done, n)
+        submitted += design.submit(seed, store, scheduler, cores=cores, **kwargs)
+    while (remaining := design.remaining()) and (gps := design.fit()):
+        trained = len(design.done)
+        max_std = float(_predicted_std(gps, design.x[remaining]).max())
+        n = min(batch, budget - len(submitted))
+        if max_std < tol or n <= 0:
+            rounds.append(AdaptiveRound(trained, max_std, []))
+            return AdaptiveReport(rounds, design.runs(), max_std < tol)
+        picked = _select(gps, design.x, remaining, n)
+        new = design.submit(picked, store, scheduler, cores=cores, **kwargs)
+        rounds.append(AdaptiveRound(trained, max_std, new))
+        submitted += new
+    return AdaptiveReport(rounds, design.runs(), not design.remaining())
@@ -1,49 +1,162 @@
-from typing import TYPE_CHECKING, TypedDict, Unpack
+import time
+from typing import TYPE_CHECKING, Literal, NamedTuple, TypedDict, Unpack
 
-import numpy as np
-from cheartpy.fe.cmd import run_prep, run_problem
+from cheartpy.fe.cmd import run_problem
 from pytools.result import Err, Ok, Result
 
-from code_pkg.mesh.api import remake_mesh
-from pfiles.pfile_inflation import create_pfile
+from code_pkg.mesh.api import ensure_mesh
+from pfiles.pfile_inflation import PFileBuilder
+
+from ._manifest import TRACE_FILES, CompletionManifest
+from ._prep import ensure_prep, prep_key
+from ._restart import merge_traces, prepare_restart
+from ._results import (
+    ResultCache,
+    neutral_problem,
+    read_result_key,
+    result_key,
+    stamp_result_key,
+)
+from ._watchdog import WatchdogDef, run_problem_watched
 
 if TYPE_CHECKING:
-    from code_pkg.types import ProblemDef
+    from pathlib import Path
+
+    from code_pkg.types import ProblemDef, RestartPoint
+
+
+_PFILES = PFileBuilder()
 
 
 def is_compelete(prob: ProblemDef) -> Result[None]:
-    apex = prob["output_dir"] / prob["prefix"] / "apex_pressure-0.D"
-    if not apex.exists():
+    entry = CompletionManifest(prob["output_dir"]).update([prob])[prob["prefix"]]
+    if (apex := entry["apex"]) is None:
         return Err(FileExistsError("Missing apex pressure file"))
-    inlet = prob["output_dir"] / prob["prefix"] / "inlet_pressure-0.D"
-    if not inlet.exists():
+    if (inlet := entry["inlet"]) is None:
         return Err(FileExistsError("Missing inlet pressure file"))
-    apex_data = np.loadtxt(apex)
-    if len(apex_data) != prob["time"]["end"]:
-        msg = f"Apex pressure file is incomplete [{len(apex_data)}/{prob['time']['end']}]"
+    if apex["rows"] != prob["time"]["end"]:
+        msg = f"Apex pressure file is incomplete [{apex['rows']}/{prob['time']['end']}]"
         return Err(ValueError(msg))
-    inlet_data = np.loadtxt(inlet)
-    if len(inlet_data) != prob["time"]["end"]:
-        msg = f"Inlet pressure file is incomplete [{len(inlet_data)}/{prob['time']['end']}]"
+    if inlet["rows"] != prob["time"]["end"]:
+        msg = f"Inlet pressure file is incomplete [{inlet['rows']}/{prob['time']['end']}]"
         return Err(ValueError(msg))
     return Ok(None)
 
 
+class RunResult(NamedTuple):
+    prefix: str
+    status: Literal["skipped", "cached", "complete", "failed", "aborted"]
+    reason: str | None = None
+    # wall time of the solver alone, without mesh, prep and PFile setup
+    solve_time: float | None = None
+
+    def __str__(self) -> str:
+        match self.status:
+            case "skipped":
+                return f"<<< {self.prefix} is already complete"
+            case "cached":
+                return f"<<< {self.prefix} reuses the results of {self.reason}"
+            case "complete":
+                return f"<<< {self.prefix} is complete"
+            case "failed":
+                return f"<<< {self.prefix} failed to complete ... {self.reason or ''}"
+            case "aborted":
+                return f"<<< {self.prefix} aborted by watchdog: {self.reason}"
+
+
 class MainKwargs(TypedDict, total=False):
     overwrite: bool
+    cores: int
+    checkpoint: int
+    watchdog: WatchdogDef | None
+
+
+def _result_key(prob: ProblemDef, mesh_key: str) -> str:
+    return result_key(prob, _PFILES.render(neutral_problem(prob)), mesh_key)
+
+
+def _solve(
+    prob: ProblemDef,
+    pfile: Path,
+    restart: RestartPoint | None,
+    *,
+    cores: int,
+    watchdog: WatchdogDef | None,
+) -> str | None:
+    log = prob["output_dir"] / f"{prob['prefix']}.log"
+    aborted = None
+    try:
+        if watchdog is None:
+            run_problem(pfile, cores=cores, log=log, output=False)
+        else:
+            traces = [prob["output_dir"] / prob["prefix"] / f for f in TRACE_FILES.values()]
+            aborted = run_problem_watched(pfile, traces, cores=cores, log=log, watchdog=watchdog)
+    finally:
+        if restart is not None:
+            merge_traces(prob)
+    return aborted
+
+
+def _finish(
+    prob: ProblemDef, cache: ResultCache, key: str, aborted: str | None, solve_time: float
+) -> RunResult:
+    if aborted is not None:
+        return RunResult(prob["prefix"], "aborted", aborted)
+    match is_compelete(prob):
+        case Ok(_):
+            cache.record(prob, key)
+            return RunResult(prob["prefix"], "complete", solve_time=solve_time)
+        case Err(e):
+            return RunResult(prob["prefix"], "failed", str(e))
+
+
+def run(prob: ProblemDef, **kwargs: Unpack[MainKwargs]) -> RunResult:
+    """Run a problem unless its results are current or another run already produced them.
+
+    Results are identified by `result_key`, so a run is redone when its definition, the
+    generated PFile or the mesh changed, or it has no key stamp, and a problem identical to a
+    completed one under another prefix gets a copy of its traces ("cached"). `overwrite`
+    always runs.
 
+    Returns
+    -------
+    RunResult
+        Outcome of the run.
 
-def run(prob: ProblemDef, **kwargs: Unpack[MainKwargs]) -> str:
-    if is_compelete(prob).ok() and not kwargs.get("overwrite"):
-        return f"<<< {prob['prefix']} is already complete"
-    remake_mesh(prob["mesh"])
+    """
+    match ensure_mesh(prob["mesh"]):
+        case Ok(mesh_key): ...  # fmt: skip
+        case Err(e):
+            return RunResult(prob["prefix"], "failed", f"failed to build mesh: {e}")
     (prob["output_dir"] / prob["prefix"]).mkdir(parents=True, exist_ok=True)
+    key = _result_key(prob, mesh_key)
+    cache, overwrite = ResultCache(prob["output_dir"]), kwargs.get("overwrite", False)
+    match None if overwrite else cache.reuse(prob, key):
+        case None: ...  # fmt: skip
+        case str(source) if source == prob["prefix"]:
+            return RunResult(prob["prefix"], "skipped")
+        case str(source):
+            return RunResult(prob["prefix"], "cached", source)
+    checkpoint = kwargs.get("checkpoint", -1)
+    restart = None
+    # checkpoints of a run with a different key, or none, are stale
+    if checkpoint > 0 and not overwrite and read_result_key(prob) == key:
+        restart = prepare_restart(prob)
+    stamp_result_key(prob, key)
     pfile = prob["output_dir"] / f"{prob['prefix']}.P"
-    with pfile.open("w") as f:
-        p = create_pfile(prob)
-        p.write(f)
-    run_prep(pfile, cores=4, log=prob["output_dir"] / f"{prob['prefix']}_prep.log")
-    run_problem(pfile, cores=4, log=prob["output_dir"] / f"{prob['prefix']}.log", output=False)
-    if is_compelete(prob).ok():
-        return f"<<< {prob['prefix']} is complete"
-    return f"<<< {prob['prefix']} failed to complete ..."
+    text = _PFILES.render(prob, checkpoint=checkpoint, restart=restart)
+    pfile.write_text(text)
+    cores = kwargs.get("cores", 4)
+    match ensure_prep(
+        prob,
+        pfile,
+        prep_key(text, mesh_key, cores),
+        cores=cores,
+        log=prob["output_dir"] / f"{prob['prefix']}_prep.log",
+    ):
+        case Ok(_): ...  # fmt: skip
+        case Err(e):
+            return RunResult(prob["prefix"], "failed", f"failed to prepare: {e}")
+    start = time.perf_counter()
+    aborted = _solve(prob, pfile, restart, cores=cores, watchdog=kwargs.get("watchdog"))
+    return _finish(prob, cache, key, aborted, time.perf_counter() - start)
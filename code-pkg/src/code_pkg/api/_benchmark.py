@@ -0,0 +1,330 @@
+import itertools
+import json
+from operator import itemgetter
+from typing import TYPE_CHECKING, Literal, NamedTuple, TypedDict, Unpack, cast
+
+import numpy as np
+from pytools.result import Err, Ok, Result
+
+from code_pkg.io import atomic_write_text, hash_def, read_pressure_columns
+from code_pkg.types import DiscretisationDef
+from pfiles.pfile_inflation import DEFAULT_SOLVER, resolve_solver
+
+from ._api import MainKwargs, is_compelete, run
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping, Sequence
+    from pathlib import Path
+
+    from numpy.typing import NDArray
+
+    from code_pkg.types import ProblemDef, SolverDef
+
+BENCHMARK_DIR = "benchmark"
+BENCHMARK_FILE = "benchmark.json"
+DEFAULT_GP = (3, 4, 6, 7, 12)
+DEFAULT_PRESSURE_ORDERS: tuple[Literal[0, 1], ...] = (1, 0)
+
+
+class _Timing(TypedDict, total=True):
+    hash: str
+    step_time: float
+
+
+class DiscretisationCase(NamedTuple):
+    prefix: str
+    discretisation: DiscretisationDef
+    step_time: float
+    error: float
+
+
+class DiscretisationReport(NamedTuple):
+    cases: list[DiscretisationCase]
+    reference: DiscretisationCase
+    recommended: DiscretisationCase
+    tol: float
+
+    def __str__(self) -> str:
+        lines = [f"{'gp':>4} {'p-order':>8} {'s/step':>10} {'error':>10}"]
+        for c in sorted(self.cases, key=lambda c: c.step_time):
+            mark = " <" if c is self.recommended else ""
+            dfn = c.discretisation
+            lines.append(
+                f"{dfn['gp']:>4} {dfn['pressure_order']:>8} "
+                f"{c.step_time:>10.4g} {c.error:>10.3e}{mark}"
+            )
+        speedup = self.reference.step_time / self.recommended.step_time
+        lines.append(
+            f"recommended {self.recommended.discretisation} (tol {self.tol:.1e}, "
+            f"{speedup:.2f}x faster than the finest setting)"
+        )
+        return "\n".join(lines)
+
+
+def discretisation_grid(
+    gp: Sequence[int] = DEFAULT_GP,
+    pressure_orders: Sequence[Literal[0, 1]] = DEFAULT_PRESSURE_ORDERS,
+) -> list[DiscretisationDef]:
+    return [
+        DiscretisationDef(gp=g, pressure_order=o) for o, g in itertools.product(pressure_orders, gp)
+    ]
+
+
+def _case_problem(prob: ProblemDef, dfn: DiscretisationDef) -> ProblemDef:
+    return {
+        **prob,
+        "prefix": f"{prob['prefix']}_gp{dfn['gp']}_p{dfn['pressure_order']}",
+        "output_dir": prob["output_dir"] / BENCHMARK_DIR,
+        "discretisation": dfn,
+    }
+
+
+def _load_timings(file: Path) -> dict[str, _Timing]:
+    if not file.is_file():
+        return {}
+    try:
+        return json.loads(file.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        print(f"Discarding corrupt benchmark file {file}")
+        return {}
+
+
+def _timed_run(
+    prob: ProblemDef, timings: dict[str, _Timing], **kwargs: Unpack[MainKwargs]
+) -> Result[float]:
+    key = hash_def(prob)
+    entry = timings.get(prob["prefix"])
+    if entry is not None and entry["hash"] == key and is_compelete(prob).ok():
+        return Ok(entry["step_time"])
+    # only the solver is timed: mesh and prep caches are cold for the first case alone
+    res = run(prob, **(kwargs | {"overwrite": True}))
+    if res.status != "complete" or res.solve_time is None:
+        return Err(RuntimeError(f"{res.status}: {res.reason}"))
+    step_time = res.solve_time / (prob["time"]["end"] - prob["time"]["start"] + 1)
+    timings[prob["prefix"]] = _Timing(hash=key, step_time=step_time)
+    return Ok(step_time)
+
+
+class _CaseRunner:
+    """Run benchmark cases, keeping their wall time per step in `file`."""
+
+    __slots__ = ("_file", "_kwargs", "_timings")
+
+    def __init__(self, file: Path, **kwargs: Unpack[MainKwargs]) -> None:
+        self._file = file
+        self._kwargs = kwargs
+        self._timings = _load_timings(file)
+
+    def __call__(self, case: ProblemDef) -> Result[tuple[float, NDArray[np.float64]]]:
+        print(f">>> Benchmarking {case['prefix']}")
+        match _timed_run(case, self._timings, **self._kwargs):
+            case Ok(step_time): ...  # fmt: skip
+            case Err(e):
+                return Err(e)
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self._file, json.dumps(self._timings, indent=1))
+        match read_pressure_columns(case):
+            case Ok(trace):
+                return Ok((step_time, trace))
+            case Err(e):
+                return Err(e)
+
+
+def trace_error(trace: NDArray[np.float64], reference: NDArray[np.float64]) -> float:
+    """Relative RMS difference of the apex and inlet pressure of two (n, 3) traces.
+
+    Returns
+    -------
+    float
+        The larger of the apex and inlet error, each scaled by the RMS of the reference.
+
+    """
+    n = min(len(trace), len(reference))
+    diff = trace[:n, 1:] - reference[:n, 1:]
+    scale = np.sqrt(np.mean(reference[:n, 1:] ** 2, axis=0))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return float(np.max(np.sqrt(np.mean(diff**2, axis=0)) / scale))
+
+
+def benchmark_discretisation(
+    prob: ProblemDef,
+    grid: Sequence[DiscretisationDef] | None = None,
+    *,
+    tol: float = 1.0e-3,
+    **kwargs: Unpack[MainKwargs],
+) -> Result[DiscretisationReport]:
+    """Run `prob` with every discretisation of `grid` and recommend the cheapest accurate one.
+
+    Runs go one at a time to `<output_dir>/benchmark/<prefix>_gp<gp>_p<order>` so their wall
+    times are comparable. Wall time per step of the solver, excluding mesh, prep and PFile
+    setup, is kept in `benchmark.json`; complete runs with a recorded time are not repeated.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        Reference problem; its own `discretisation` is ignored.
+    grid: Sequence[DiscretisationDef] | None
+        Settings to compare, `discretisation_grid()` by default.
+    tol: float
+        Largest accepted relative RMS error of the apex and inlet pressure against the finest
+        setting (highest pressure order, then most quadrature points).
+    kwargs: MainKwargs
+        Passed to `run`; `overwrite` is forced for runs that need timing.
+
+    Returns
+    -------
+    Result[DiscretisationReport]
+        Err if the finest setting fails to run.
+
+    """
+    grid = sorted(
+        discretisation_grid() if grid is None else grid,
+        key=itemgetter("pressure_order", "gp"),
+        reverse=True,
+    )
+    if not grid:
+        return Err(ValueError("Empty discretisation grid"))
+    runner = _CaseRunner(prob["output_dir"] / BENCHMARK_DIR / BENCHMARK_FILE, **kwargs)
+    runs: list[tuple[str, DiscretisationDef, float, NDArray[np.float64]]] = []
+    for dfn in grid:
+        case = _case_problem(prob, dfn)
+        match runner(case):
+            case Ok((step_time, trace)):
+                runs.append((case["prefix"], dfn, step_time, trace))
+            case Err(e):
+                print(f"<<< {case['prefix']} failed: {e}")
+    if not runs or runs[0][1] is not grid[0]:
+        return Err(RuntimeError(f"Finest setting {grid[0]} did not complete"))
+    ref = runs[0][3]
+    cases = [DiscretisationCase(k, d, t, trace_error(trace, ref)) for k, d, t, trace in runs]
+    accurate = [c for c in cases if c.error <= tol]
+    recommended = min(accurate, key=lambda c: c.step_time, default=cases[0])
+    return Ok(DiscretisationReport(cases, cases[0], recommended, tol))
+
+
+class SolverCase(NamedTuple):
+    prefix: str
+    solver: SolverDef
+    step_time: float
+    error: float
+
+
+class SolverReport(NamedTuple):
+    cases: list[SolverCase]
+    reference: SolverCase
+    best: SolverCase
+    tol: float
+
+    @property
+    def profile(self) -> SolverDef:
+        """Settings of the best case that differ from `DEFAULT_SOLVER`, for `ProblemDef.solver`.
+
+        Returns
+        -------
+        SolverDef
+            Empty if the defaults are best.
+
+        """
+        return cast(
+            "SolverDef", {k: v for k, v in self.best.solver.items() if DEFAULT_SOLVER.get(k) != v}
+        )
+
+    def apply(self, prob: ProblemDef) -> ProblemDef:
+        return {**prob, "solver": self.profile}
+
+    def __str__(self) -> str:
+        lines = [f"{'s/step':>10} {'error':>10}  settings"]
+        for c in sorted(self.cases, key=lambda c: c.step_time):
+            mark = " <" if c is self.best else ""
+            diff = {k: v for k, v in c.solver.items() if self.reference.solver.get(k) != v}
+            lines.append(f"{c.step_time:>10.4g} {c.error:>10.3e}  {diff or 'reference'}{mark}")
+        speedup = self.reference.step_time / self.best.step_time
+        lines.append(
+            f"best profile {json.dumps(self.profile)} ({speedup:.2f}x, tol {self.tol:.1e})"
+        )
+        return "\n".join(lines)
+
+
+AUTOTUNE_DIR = "autotune"
+_MIN_GAIN = 0.02
+SOLVER_CHOICES: Mapping[str, Sequence[object]] = {
+    "matrix_calculation": ("EVALUATE_EVERY_BUILD", "EVALUATE_ONCE"),
+    "ale_calculation": ("EVALUATE_EVERY_BUILD", "EVALUATE_ONCE"),
+    "method": ("seq_fp_linesearch", "seq_fp"),
+    "ale_first": (False, True),
+    "subiter_fraction": (0.5, 0.25, 1.0),
+    "scale_first_residual": (1000.0, 1.0),
+    "subiterations": (12, 8, 20),
+}
+
+
+def _window_problem(prob: ProblemDef, solver: SolverDef, window: int) -> ProblemDef:
+    start, end = prob["time"]["start"], prob["time"]["end"]
+    return {
+        **prob,
+        "prefix": f"{prob['prefix']}_{hash_def(solver)[:10]}",
+        "output_dir": prob["output_dir"] / AUTOTUNE_DIR,
+        "time": {**prob["time"], "end": min(end, start + window - 1)},
+        "solver": solver,
+    }
+
+
+def autotune_solver(
+    prob: ProblemDef,
+    choices: Mapping[str, Sequence[object]] = SOLVER_CHOICES,
+    *,
+    window: int = 100,
+    tol: float = 1.0e-3,
+    **kwargs: Unpack[MainKwargs],
+) -> Result[SolverReport]:
+    """Search the solver settings minimising wall time on the first `window` steps of `prob`.
+
+    Starting from the settings of `prob`, every key of `choices` is tried in turn with each of
+    its values. A value is kept when it is over 2% faster than the best so far and the apex and
+    inlet pressure stay within `tol` (relative RMS) of the starting settings. Runs go one at a
+    time to `<output_dir>/autotune`, their timings are kept in `benchmark.json`.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        Representative problem.
+    choices: Mapping[str, Sequence[object]]
+        Values to try for `SolverDef` keys, searched one key at a time in this order.
+    window: int
+        Number of time steps of each run.
+    tol: float
+        Largest accepted relative RMS error against the starting settings.
+    kwargs: MainKwargs
+        Passed to `run`.
+
+    Returns
+    -------
+    Result[SolverReport]
+        Err if the starting settings fail to run; apply the result with `SolverReport.apply`.
+
+    """
+    runner = _CaseRunner(prob["output_dir"] / AUTOTUNE_DIR / BENCHMARK_FILE, **kwargs)
+    solver = resolve_solver(prob)
+    ref_case = _window_problem(prob, solver, window)
+    match runner(ref_case):
+        case Ok((step_time, ref)): ...  # fmt: skip
+        case Err(e):
+            return Err(RuntimeError(f"Reference settings {solver} failed: {e}"))
+    best = reference = SolverCase(ref_case["prefix"], solver, step_time, 0.0)
+    cases = {reference.prefix: reference}
+    for key, values in choices.items():
+        for value in values:
+            case = _window_problem(prob, cast("SolverDef", {**best.solver, key: value}), window)
+            if case["prefix"] in cases:
+                continue
+            match runner(case):
+                case Ok((step_time, trace)):
+                    c = SolverCase(
+                        case["prefix"], case["solver"], step_time, trace_error(trace, ref)
+                    )
+                    cases[c.prefix] = c
+                    if c.error <= tol and c.step_time < (1.0 - _MIN_GAIN) * best.step_time:
+                        best = c
+                case Err(e):
+                    print(f"<<< {case['prefix']} failed: {e}")
+    return Ok(SolverReport(list(cases.values()), reference, best, tol))
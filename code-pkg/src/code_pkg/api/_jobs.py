@@ -0,0 +1,310 @@
+import itertools
+import os
+import socket
+import sqlite3
+import threading
+import time
+from collections.abc import Sequence
+from functools import partial
+from typing import TYPE_CHECKING, Literal, NamedTuple, Self, TypedDict, Unpack
+
+from code_pkg.io import hash_def
+
+from ._api import MainKwargs, RunResult, run
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable
+    from concurrent.futures import Future
+    from pathlib import Path
+    from types import TracebackType
+
+    from code_pkg.types import ProblemDef
+
+    from ._logs import LogMonitor
+    from ._scheduler import CoreScheduler
+
+type JobState = Literal["queued", "running", "done", "failed"]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    prefix TEXT PRIMARY KEY,
+    hash TEXT NOT NULL,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    reason TEXT,
+    owner TEXT,
+    heartbeat REAL,
+    not_before REAL NOT NULL DEFAULT 0,
+    submitted REAL NOT NULL,
+    started REAL,
+    finished REAL,
+    elapsed REAL
+)
+"""
+
+
+class RetryPolicy(TypedDict, total=False):
+    max_attempts: int
+    backoff: float
+    backoff_factor: float
+
+
+class JobRow(NamedTuple):
+    prefix: str
+    hash: str
+    state: JobState
+    attempts: int
+    reason: str | None
+    owner: str | None
+    started: float | None
+    finished: float | None
+    elapsed: float | None
+
+
+def _owner_alive(owner: str) -> bool:
+    host, _, pid = owner.rpartition(":")
+    if host != socket.gethostname():
+        return True
+    try:
+        os.kill(int(pid), 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+class JobStore:
+    """SQLite-backed record of the jobs of a sweep, keyed by prefix and definition hash.
+
+    Jobs move from queued to running (claimed atomically by one driver) to done or failed.
+    Failed attempts are requeued with exponential backoff until `max_attempts` is reached;
+    runs aborted by the watchdog fail at once.
+    """
+
+    __slots__ = ("_db", "_lock", "_retry", "owner")
+
+    def __init__(self, file: Path, **kwargs: Unpack[RetryPolicy]) -> None:
+        file.parent.mkdir(parents=True, exist_ok=True)
+        self._db = sqlite3.connect(file, isolation_level=None, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA busy_timeout=30000")
+        self._db.execute(_SCHEMA)
+        self._lock = threading.Lock()
+        self._retry = RetryPolicy(
+            max_attempts=kwargs.get("max_attempts", 3),
+            backoff=kwargs.get("backoff", 60.0),
+            backoff_factor=kwargs.get("backoff_factor", 2.0),
+        )
+        self.owner = f"{socket.gethostname()}:{os.getpid()}"
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def enqueue(self, probs: Iterable[ProblemDef]) -> int:
+        now = time.time()
+        rows = [(p["prefix"], hash_def(p), now) for p in probs]
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            before = self._db.total_changes
+            self._db.executemany(
+                """
+                INSERT INTO jobs (prefix, hash, state, submitted) VALUES (?, ?, 'queued', ?)
+                ON CONFLICT (prefix) DO UPDATE SET
+                    hash = excluded.hash, state = 'queued', attempts = 0, reason = NULL,
+                    owner = NULL, not_before = 0, submitted = excluded.submitted,
+                    started = NULL, finished = NULL, elapsed = NULL
+                WHERE jobs.hash != excluded.hash AND jobs.state != 'running'
+                """,
+                rows,
+            )
+            self._db.execute("COMMIT")
+            return self._db.total_changes - before
+
+    def reclaim(self, stale: float = 900.0) -> int:
+        # running jobs whose driver died or stopped sending heartbeats
+        now = time.time()
+        with self._lock:
+            running = self._db.execute(
+                "SELECT prefix, owner, heartbeat FROM jobs WHERE state = 'running'"
+            ).fetchall()
+            lost = [
+                (p,)
+                for p, owner, beat in running
+                if owner is None or not _owner_alive(owner) or now - (beat or 0.0) > stale
+            ]
+            self._db.executemany(
+                "UPDATE jobs SET state = 'queued', owner = NULL, reason = 'reclaimed' "
+                "WHERE prefix = ? AND state = 'running'",
+                lost,
+            )
+        return len(lost)
+
+    def requeue_failed(self) -> int:
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE jobs SET state = 'queued', attempts = 0, not_before = 0 "
+                "WHERE state = 'failed'"
+            )
+        return cur.rowcount
+
+    def ready(self, prefixes: Sequence[str]) -> list[str]:
+        now = time.time()
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT prefix FROM jobs WHERE state = 'queued' AND not_before <= ?", (now,)
+            ).fetchall()
+        queued = {p for (p,) in rows}
+        return [p for p in prefixes if p in queued]
+
+    def claim(self, prefix: str) -> bool:
+        now = time.time()
+        with self._lock:
+            cur = self._db.execute(
+                "UPDATE jobs SET state = 'running', owner = ?, heartbeat = ?, started = ?, "
+                "attempts = attempts + 1 WHERE prefix = ? AND state = 'queued'",
+                (self.owner, now, now, prefix),
+            )
+        return cur.rowcount == 1
+
+    def heartbeat(self) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE jobs SET heartbeat = ? WHERE owner = ? AND state = 'running'",
+                (time.time(), self.owner),
+            )
+
+    def finish(self, prefix: str, result: RunResult | BaseException) -> JobState:
+        now = time.time()
+        match result:
+            case RunResult(status="complete" | "skipped" | "cached"):
+                state, reason = "done", None
+            case RunResult(status="aborted", reason=reason):
+                # a watchdog abort, e.g. divergence, would recur on every attempt
+                state = "failed"
+            case RunResult(reason=reason):
+                state = "queued"
+            case BaseException():
+                state, reason = "queued", f"{type(result).__name__}: {result}"
+        with self._lock:
+            (attempts, started) = self._db.execute(
+                "SELECT attempts, started FROM jobs WHERE prefix = ?", (prefix,)
+            ).fetchone()
+            delay = 0.0
+            if state == "queued":
+                if attempts >= self._retry["max_attempts"]:
+                    state = "failed"
+                else:
+                    delay = self._retry["backoff"] * self._retry["backoff_factor"] ** (attempts - 1)
+            self._db.execute(
+                "UPDATE jobs SET state = ?, reason = ?, owner = NULL, not_before = ?, "
+                "finished = ?, elapsed = ? WHERE prefix = ?",
+                (state, reason, now + delay, now, now - (started or now), prefix),
+            )
+        return state
+
+    def jobs(self) -> list[JobRow]:
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT prefix, hash, state, attempts, reason, owner, started, finished, elapsed "
+                "FROM jobs ORDER BY prefix"
+            ).fetchall()
+        return list(itertools.starmap(JobRow, rows))
+
+    def summary(self) -> dict[JobState, int]:
+        with self._lock:
+            rows = self._db.execute("SELECT state, COUNT(*) FROM jobs GROUP BY state").fetchall()
+        return dict(rows)
+
+
+def run_sweep(  # noqa: C901, PLR0913
+    probs: Iterable[ProblemDef],
+    store: JobStore,
+    scheduler: CoreScheduler,
+    *,
+    cores: int = 4,
+    poll: float = 10.0,
+    on_done: Callable[[str], None] | None = None,
+    monitor: LogMonitor | None = None,
+    **kwargs: Unpack[MainKwargs],
+) -> dict[JobState, int]:
+    """Drive `run` for every problem through `store`, resuming where a previous driver stopped.
+
+    Parameters
+    ----------
+    probs: Iterable[ProblemDef]
+        Problems of the sweep; ready jobs are submitted in this order. Sequences such as a
+        `SweepSpec` are indexed rather than copied, other iterables are collected first.
+    store: JobStore
+        Job database; jobs already done with the same definition hash are not rerun.
+    scheduler: CoreScheduler
+        Scheduler executing the jobs.
+    cores: int
+        Cores per job.
+    poll: float
+        Seconds between checks for jobs whose retry backoff has expired.
+    on_done: Callable[[str], None] | None
+        Called with the prefix of every job that is done, including those done before.
+    monitor: LogMonitor | None
+        If given, the solver logs are followed and the sweep progress is printed every poll.
+    kwargs: MainKwargs
+        Forwarded to `run`.
+
+    Returns
+    -------
+    dict[JobState, int]
+        Number of jobs in each state once no job is queued or running.
+
+    """
+    probs = probs if isinstance(probs, Sequence) else list(probs)
+    index = {p["prefix"]: i for i, p in enumerate(probs)}
+    store.reclaim()
+    store.enqueue(probs)
+    in_flight: dict[str, Future[RunResult]] = {}
+    done = threading.Event()
+    hooks = [] if on_done is None else [on_done]
+    if monitor is not None:
+        hooks.insert(0, lambda prefix: monitor.finish(probs[index[prefix]]))
+    for j in store.jobs():
+        if j.state == "done" and j.prefix in index:
+            for hook in hooks:
+                hook(j.prefix)
+
+    def _finish(prefix: str, future: Future[RunResult]) -> None:
+        exc = future.exception()
+        state = store.finish(prefix, future.result() if exc is None else exc)
+        print(f"<<< {prefix} -> {state}")
+        in_flight.pop(prefix, None)
+        if state == "done":
+            for hook in hooks:
+                hook(prefix)
+        done.set()
+
+    while True:
+        store.heartbeat()
+        for prefix in store.ready(list(index)):
+            if prefix in in_flight or not store.claim(prefix):
+                continue
+            job = partial(run, probs[index[prefix]], **{**kwargs, "cores": cores})
+            in_flight[prefix] = future = scheduler.submit(job, cores=cores, name=prefix)
+            future.add_done_callback(partial(_finish, prefix))
+        states = {j.prefix: j.state for j in store.jobs() if j.prefix in index}
+        if not in_flight and not any(s in {"queued", "running"} for s in states.values()):
+            break
+        if monitor is not None:
+            print(monitor.sweep(probs, workers=max(len(in_flight), 1)))
+        done.wait(poll)
+        done.clear()
+    return store.summary()
@@ -0,0 +1,366 @@
+import json
+import re
+import statistics
+import threading
+import time
+from typing import TYPE_CHECKING, NamedTuple, TypedDict
+
+from pfiles.pfile_inflation import DEFAULT_SOLVER, resolve_solver
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from code_pkg.types import ProblemDef
+
+STEP_RECORDS = ".steps.jsonl"
+_NUMBER = r"([-+]?(?:\d+\.?\d*|\.\d+)(?:[eEdD][-+]?\d+)?)"
+
+
+class LogPatterns(NamedTuple):
+    """Regular expressions recognising the events of a solver log, matched line by line."""
+
+    step: re.Pattern[str]
+    iteration: re.Pattern[str]
+    residual: re.Pattern[str]
+    linesearch: re.Pattern[str]
+    elapsed: re.Pattern[str]
+    error: re.Pattern[str]
+
+
+# Not yet checked against a cheartsolver.out log; RunLog.finish reports logs without steps
+CHEART_PATTERNS = LogPatterns(
+    step=re.compile(r"time\s*step\W*(\d+)", re.IGNORECASE),
+    iteration=re.compile(r"\biter(?:ation)?\W*(\d+)", re.IGNORECASE),
+    residual=re.compile(rf"(?:\bres(?:idual)?\b|\|\|r\|\|)\W*{_NUMBER}", re.IGNORECASE),
+    linesearch=re.compile(r"line\s*search", re.IGNORECASE),
+    elapsed=re.compile(rf"(?:elapsed|wall\s*time)\D*?{_NUMBER}\s*s", re.IGNORECASE),
+    # only lines that start with an error marker, not ones mentioning e.g. a residual error
+    error=re.compile(r"^\W*(?:(?:fatal\s+)?error\s*[:!]|fatal\b|abort(?:ed|ing)\b)", re.IGNORECASE),
+)
+
+
+class FileTail:
+    """Read the complete lines appended to a file since the last call."""
+
+    __slots__ = ("buffer", "file", "offset")
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        self.offset = 0
+        self.buffer = b""
+
+    def read_rows(self) -> list[bytes]:
+        try:
+            size = self.file.stat().st_size
+        except FileNotFoundError:
+            return []
+        if size < self.offset:
+            self.offset, self.buffer = 0, b""
+        if size == self.offset:
+            return []
+        with self.file.open("rb") as f:
+            f.seek(self.offset)
+            data = self.buffer + f.read(size - self.offset)
+        self.offset = size
+        *rows, self.buffer = data.split(b"\n")
+        return [r for r in rows if r.strip()]
+
+
+class StepRecord(TypedDict, total=True):
+    step: int
+    wall: float | None
+    iterations: int
+    residuals: list[float]
+    linesearch: int
+    capped: bool
+
+
+def _parse_number(value: str) -> float:
+    return float(value.replace("d", "e").replace("D", "e"))
+
+
+class RunLog:
+    """Incrementally parse a solver log into one `StepRecord` per time step.
+
+    A step is recorded once the next one starts or `finish` is called. Its wall time is taken
+    from the log if it reports one, otherwise from when steps were seen to complete while
+    following the log; steps found on the first read of an existing log have no wall time.
+    Records are appended to `records` as JSON lines, see `read_step_records`.
+    """
+
+    __slots__ = ("_current", "_patterns", "_seen", "_tail", "cap", "errors", "records", "steps")
+
+    def __init__(
+        self,
+        log: Path,
+        records: Path | None = None,
+        *,
+        cap: int = DEFAULT_SOLVER["subiterations"],
+        patterns: LogPatterns = CHEART_PATTERNS,
+    ) -> None:
+        self._tail = FileTail(log)
+        self._patterns = patterns
+        self._current: StepRecord | None = None
+        self._seen: float | None = None
+        self.cap = cap
+        self.records = records
+        self.steps: list[StepRecord] = []
+        self.errors: list[str] = []
+
+    def _parse_line(self, line: str) -> StepRecord | None:
+        p, cur = self._patterns, self._current
+        if m := p.step.search(line):
+            self._current = StepRecord(
+                step=int(m[1]), wall=None, iterations=0, residuals=[], linesearch=0, capped=False
+            )
+            return cur
+        if p.error.search(line):
+            self.errors.append(line.strip())
+        if cur is None:
+            return None
+        if m := p.iteration.search(line):
+            cur["iterations"] = max(cur["iterations"], int(m[1]))
+        if m := p.residual.search(line):
+            cur["residuals"].append(_parse_number(m[1]))
+        if p.linesearch.search(line):
+            cur["linesearch"] += 1
+        if m := p.elapsed.search(line):
+            cur["wall"] = _parse_number(m[1])
+        return None
+
+    def _close(self, closed: list[StepRecord]) -> list[StepRecord]:
+        now = time.monotonic()
+        untimed = [s for s in closed if s["wall"] is None]
+        for s in closed:
+            s["iterations"] = s["iterations"] or len(s["residuals"])
+            s["capped"] = s["iterations"] >= self.cap
+        if self._seen is not None and untimed:
+            for s in untimed:
+                s["wall"] = (now - self._seen) / len(untimed)
+        if closed:
+            self._seen = now
+        for s in closed:
+            # a rerun from an earlier step replaces the records from that step on
+            while self.steps and self.steps[-1]["step"] >= s["step"]:
+                self.steps.pop()
+            self.steps.append(s)
+        if self.records is not None and closed:
+            with self.records.open("a", encoding="utf-8") as f:
+                f.writelines(json.dumps(s) + "\n" for s in closed)
+        return closed
+
+    def poll(self) -> list[StepRecord]:
+        """Parse the lines appended since the last call.
+
+        Returns
+        -------
+        list[StepRecord]
+            The steps completed since the last call.
+
+        """
+        parsed = [self._parse_line(row.decode(errors="replace")) for row in self._tail.read_rows()]
+        closed = [s for s in parsed if s is not None]
+        if self._seen is None and not closed:
+            self._seen = time.monotonic()
+        return self._close(closed)
+
+    def finish(self) -> list[StepRecord]:
+        """Parse the rest of the log and record the last step.
+
+        A log that has content but no recognised step is reported, as its format does not
+        match the patterns.
+
+        Returns
+        -------
+        list[StepRecord]
+            The steps completed since the last call.
+
+        """
+        closed = self.poll()
+        if (cur := self._current) is not None:
+            self._current = None
+            closed.extend(self._close([cur]))
+        if not self.steps and self._tail.offset > 0:
+            print(f"Warning: no time steps recognised in {self._tail.file}, check its LogPatterns")
+        return closed
+
+
+def read_step_records(file: Path) -> list[StepRecord]:
+    """Read the records written by `RunLog`.
+
+    A record of a step at or before an earlier record (a rerun or restart) replaces the
+    records from that step on.
+
+    Returns
+    -------
+    list[StepRecord]
+        Records ordered by step; empty if the file does not exist.
+
+    """
+    if not file.is_file():
+        return []
+    steps: list[StepRecord] = []
+    with file.open(encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            rec: StepRecord = json.loads(line)
+            while steps and steps[-1]["step"] >= rec["step"]:
+                steps.pop()
+            steps.append(rec)
+    return steps
+
+
+class PrepSummary(NamedTuple):
+    lines: int
+    errors: list[str]
+    elapsed: float | None
+
+
+def read_prep_log(file: Path, patterns: LogPatterns = CHEART_PATTERNS) -> PrepSummary | None:
+    """Summarise a preprocessing log.
+
+    Returns
+    -------
+    PrepSummary | None
+        Line count, error lines and the last reported elapsed time; None if there is no log.
+
+    """
+    if not file.is_file():
+        return None
+    lines = file.read_text(encoding="utf-8", errors="replace").splitlines()
+    errors = [ln.strip() for ln in lines if patterns.error.search(ln)]
+    elapsed = [_parse_number(m[1]) for ln in lines if (m := patterns.elapsed.search(ln))]
+    return PrepSummary(len(lines), errors, elapsed[-1] if elapsed else None)
+
+
+def _format_duration(seconds: float | None) -> str:
+    if seconds is None:
+        return "--:--:--"
+    minutes, secs = divmod(round(seconds), 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{secs:02d}"
+
+
+class Progress(NamedTuple):
+    prefix: str
+    done: int
+    total: int
+    step_time: float | None
+    iterations: float | None
+    capped: int
+    errors: int
+
+    @property
+    def remaining(self) -> int:
+        return max(self.total - self.done, 0)
+
+    @property
+    def eta(self) -> float | None:
+        return None if self.step_time is None else self.remaining * self.step_time
+
+    def __str__(self) -> str:
+        pct = 100.0 * self.done / self.total if self.total else 100.0
+        its = "--" if self.iterations is None else f"{self.iterations:.1f}"
+        return (
+            f"{self.prefix}: {self.done}/{self.total} ({pct:.0f}%), {its} it/step, "
+            f"{self.capped} capped, ETA {_format_duration(self.eta)}"
+        )
+
+
+class SweepProgress(NamedTuple):
+    jobs: list[Progress]
+    workers: int
+
+    @property
+    def step_time(self) -> float | None:
+        times = [j.step_time for j in self.jobs if j.step_time is not None]
+        return statistics.median(times) if times else None
+
+    @property
+    def eta(self) -> float | None:
+        if (step_time := self.step_time) is None:
+            return None
+        return sum(j.remaining for j in self.jobs) * step_time / max(self.workers, 1)
+
+    def __str__(self) -> str:
+        done = sum(j.done for j in self.jobs)
+        total = sum(j.total for j in self.jobs)
+        running = [str(j) for j in self.jobs if 0 < j.done < j.total]
+        finished = sum(j.remaining == 0 for j in self.jobs)
+        summary = (
+            f"{finished}/{len(self.jobs)} runs, {done}/{total} steps, "
+            f"ETA {_format_duration(self.eta)} on {self.workers} workers"
+        )
+        return "\n".join([*running, summary])
+
+
+class LogMonitor:
+    """Follow the run logs of a sweep, persisting step records and estimating completion.
+
+    Logs are read from `<output_dir>/<prefix>.log` and records written next to them as
+    `<prefix>.steps.jsonl`. Step times are averaged over the last `window` timed steps.
+    """
+
+    __slots__ = ("_lock", "_logs", "window")
+
+    def __init__(self, window: int = 50) -> None:
+        self._logs: dict[Path, RunLog] = {}
+        self._lock = threading.Lock()
+        self.window = window
+
+    def _log(self, prob: ProblemDef) -> RunLog:
+        log = prob["output_dir"] / f"{prob['prefix']}.log"
+        if (run := self._logs.get(log)) is None:
+            records = prob["output_dir"] / f"{prob['prefix']}{STEP_RECORDS}"
+            cap = resolve_solver(prob)["subiterations"]
+            run = self._logs[log] = RunLog(log, records, cap=cap)
+        return run
+
+    def _progress(self, prob: ProblemDef, run: RunLog) -> Progress:
+        start, end = prob["time"]["start"], prob["time"]["end"]
+        steps = run.steps
+        done = steps[-1]["step"] - start + 1 if steps else 0
+        recent = steps[-self.window :]
+        walls = [s["wall"] for s in recent if s["wall"] is not None]
+        return Progress(
+            prefix=prob["prefix"],
+            done=min(done, end - start + 1),
+            total=end - start + 1,
+            step_time=statistics.fmean(walls) if walls else None,
+            iterations=statistics.fmean(s["iterations"] for s in recent) if recent else None,
+            capped=sum(s["capped"] for s in steps),
+            errors=len(run.errors),
+        )
+
+    def progress(self, prob: ProblemDef) -> Progress:
+        with self._lock:
+            run = self._log(prob)
+            run.poll()
+            return self._progress(prob, run)
+
+    def finish(self, prob: ProblemDef) -> Progress:
+        """Parse the rest of the log of a run that has exited.
+
+        Returns
+        -------
+        Progress
+            Final progress of the run.
+
+        """
+        with self._lock:
+            run = self._log(prob)
+            run.finish()
+            return self._progress(prob, run)
+
+    def sweep(self, probs: Iterable[ProblemDef], *, workers: int = 1) -> SweepProgress:
+        """Poll the logs of every run of a sweep.
+
+        Returns
+        -------
+        SweepProgress
+            Per-run progress and the sweep ETA for `workers` concurrent runs.
+
+        """
+        return SweepProgress([self.progress(p) for p in probs], workers)
@@ -0,0 +1,197 @@
+import json
+import zlib
+from collections import defaultdict
+from typing import TYPE_CHECKING, Literal, TypedDict
+
+from code_pkg.io import atomic_write_text, file_lock
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Mapping
+    from pathlib import Path
+    from typing import BinaryIO
+
+    from code_pkg.types import ProblemDef
+
+type RunStatus = Literal["done", "partial", "nan", "missing"]
+type TraceName = Literal["apex", "inlet"]
+
+MANIFEST_FILE = ".completion.json"
+TRACE_FILES: Mapping[TraceName, str] = {
+    "apex": "apex_pressure-0.D",
+    "inlet": "inlet_pressure-0.D",
+}
+_CHUNK = 1 << 20
+_TAIL = 64
+_NONFINITE = (b"nan", b"inf")
+
+
+class TraceProbe(TypedDict, total=True):
+    size: int
+    mtime_ns: int
+    rows: int
+    last_time: float | None
+    finite: bool
+    tail_crc: int
+
+
+class RunEntry(TypedDict, total=True):
+    expected: int
+    status: RunStatus
+    apex: TraceProbe | None
+    inlet: TraceProbe | None
+
+
+def _tail_crc(f: BinaryIO, end: int) -> int:
+    f.seek(max(end - _TAIL, 0))
+    return zlib.crc32(f.read(min(end, _TAIL)))
+
+
+def _scan(f: BinaryIO, start: int, end: int) -> tuple[int, bool]:
+    f.seek(max(start - 2, 0))
+    rows, finite, carry = 0, True, f.read(start - f.tell()).lower()
+    while start < end:
+        chunk = f.read(min(_CHUNK, end - start))
+        if not chunk:
+            break
+        start += len(chunk)
+        rows += chunk.count(b"\n")
+        window = carry + chunk.lower()
+        finite = finite and not any(s in window for s in _NONFINITE)
+        carry = window[-2:]
+    return rows, finite
+
+
+def _last_time(f: BinaryIO, end: int) -> float | None:
+    f.seek(max(end - 4096, 0))
+    lines = [ln for ln in f.read().splitlines() if ln.strip()]
+    if not lines:
+        return None
+    try:
+        return float(lines[-1].split()[0])
+    except ValueError:
+        return None
+
+
+def probe_trace(file: Path, prev: TraceProbe | None = None) -> TraceProbe | None:
+    """Return size, row count, last time and a finite flag of a trace without parsing floats.
+
+    When `prev` describes an earlier, shorter state of the same file (checked through a
+    checksum of its tail), only the appended bytes are scanned.
+
+    Parameters
+    ----------
+    file: Path
+        Text trace written by CHeart, one row per time step.
+    prev: TraceProbe | None
+        Previous probe of the same file, if any.
+
+    Returns
+    -------
+    TraceProbe | None
+        None if the file does not exist.
+
+    """
+    try:
+        stat = file.stat()
+    except FileNotFoundError:
+        return None
+    if prev is not None and (prev["size"], prev["mtime_ns"]) == (stat.st_size, stat.st_mtime_ns):
+        return prev
+    with file.open("rb") as f:
+        rows, finite, start = 0, True, 0
+        if (
+            prev is not None
+            and 0 < prev["size"] <= stat.st_size
+            and _tail_crc(f, prev["size"]) == prev["tail_crc"]
+        ):
+            rows, finite, start = prev["rows"], prev["finite"], prev["size"]
+            f.seek(start - 1)
+            rows -= int(f.read(1) != b"\n")
+        new_rows, new_finite = _scan(f, start, stat.st_size)
+        rows += new_rows
+        if stat.st_size > 0:
+            f.seek(stat.st_size - 1)
+            rows += int(f.read(1) != b"\n")
+        return TraceProbe(
+            size=stat.st_size,
+            mtime_ns=stat.st_mtime_ns,
+            rows=rows,
+            last_time=_last_time(f, stat.st_size),
+            finite=finite and new_finite,
+            tail_crc=_tail_crc(f, stat.st_size),
+        )
+
+
+def _classify(expected: int, apex: TraceProbe | None, inlet: TraceProbe | None) -> RunStatus:
+    if apex is None or inlet is None:
+        return "missing"
+    if not (apex["finite"] and inlet["finite"]):
+        return "nan"
+    if apex["rows"] != expected or inlet["rows"] != expected:
+        return "partial"
+    return "done"
+
+
+class CompletionManifest:
+    """Per-sweep index of trace probes stored as `<output_dir>/.completion.json`."""
+
+    __slots__ = ("_entries", "_file")
+
+    def __init__(self, output_dir: Path) -> None:
+        self._file = output_dir / MANIFEST_FILE
+        self._entries: dict[str, RunEntry] = {}
+
+    def _load(self) -> None:
+        self._entries = {}
+        if not self._file.is_file():
+            return
+        try:
+            self._entries = json.loads(self._file.read_text(encoding="utf-8"))
+        except json.JSONDecodeError:
+            print(f"Discarding corrupt manifest {self._file}")
+
+    def _probe(self, prob: ProblemDef) -> RunEntry:
+        home = prob["output_dir"] / prob["prefix"]
+        prev = self._entries.get(prob["prefix"])
+        apex = probe_trace(home / TRACE_FILES["apex"], prev["apex"] if prev else None)
+        inlet = probe_trace(home / TRACE_FILES["inlet"], prev["inlet"] if prev else None)
+        expected = prob["time"]["end"]
+        return RunEntry(
+            expected=expected,
+            status=_classify(expected, apex, inlet),
+            apex=apex,
+            inlet=inlet,
+        )
+
+    def update(self, probs: Iterable[ProblemDef]) -> dict[str, RunEntry]:
+        self._file.parent.mkdir(parents=True, exist_ok=True)
+        with file_lock(self._file.with_suffix(".lock")):
+            self._load()
+            res = {p["prefix"]: self._probe(p) for p in probs}
+            self._entries.update(res)
+            atomic_write_text(self._file, json.dumps(self._entries, indent=1))
+        return res
+
+
+def sweep_status(probs: Iterable[ProblemDef]) -> dict[str, RunStatus]:
+    """Return the completion status of every problem, updating the per-sweep manifests.
+
+    Parameters
+    ----------
+    probs: Iterable[ProblemDef]
+        Problems to check; they are grouped by `output_dir`, one manifest per directory.
+
+    Returns
+    -------
+    dict[str, RunStatus]
+        Map from prefix to "done", "partial", "nan" (non-finite values) or "missing".
+
+    """
+    by_dir: defaultdict[Path, list[ProblemDef]] = defaultdict(list)
+    for p in probs:
+        by_dir[p["output_dir"]].append(p)
+    return {
+        k: v["status"]
+        for d, ps in by_dir.items()
+        for k, v in CompletionManifest(d).update(ps).items()
+    }
@@ -0,0 +1,153 @@
+import json
+import shutil
+import subprocess  # noqa: S404
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from cheartpy.fe.cmd import run_prep
+from pytools.result import Err, Ok, Result
+
+from code_pkg.io import atomic_copy, atomic_write_text, file_lock, hash_def
+
+if TYPE_CHECKING:
+    from code_pkg.types import ProblemDef
+
+PREP_DIRECTIVES = ("!UseBasis", "!DefTopology", "!SetTopology", "!DefInterface")
+_CACHE_DIR = ".prep-cache"
+_CACHE_KEY = ".prep-key"
+_PRODUCTS = "products.json"
+
+
+def prep_key(pfile_text: str, mesh_key: str, cores: int) -> str:
+    """Hash the basis, topology and interface directives of a PFile with the mesh key and cores.
+
+    The partitions written by `run_prep` depend on the number of ranks, so `cores` is part
+    of the key.
+
+    Parameters
+    ----------
+    pfile_text: str
+        The generated PFile.
+    mesh_key: str
+        Key of the installed mesh, see `code_pkg.mesh.api.ensure_mesh`.
+    cores: int
+        Number of cores the problem is preprocessed and run with.
+
+    Returns
+    -------
+    str
+        Key shared by every problem whose preprocessing products are identical.
+
+    """
+    lines = [
+        " ".join(ln.split())
+        for ln in pfile_text.splitlines()
+        if ln.lstrip().startswith(PREP_DIRECTIVES)
+    ]
+    return hash_def({"prep": lines, "mesh": mesh_key, "cores": cores})
+
+
+def _snapshot(folder: Path) -> dict[str, tuple[int, int]]:
+    return {
+        f.name: ((s := f.stat()).st_size, s.st_mtime_ns)
+        for f in folder.iterdir()
+        if f.is_file() and not f.name.startswith(".")
+    }
+
+
+def _has_products(folder: Path, products: dict[str, int]) -> bool:
+    return all(
+        (folder / k).is_file() and (folder / k).stat().st_size == v for k, v in products.items()
+    )
+
+
+def _load_products(entry: Path) -> dict[str, int] | None:
+    if not (entry / _PRODUCTS).is_file():
+        return None
+    products: dict[str, int] = json.loads((entry / _PRODUCTS).read_text(encoding="utf-8"))
+    # an empty product set would make every run look prepared
+    return products if products and _has_products(entry, products) else None
+
+
+def _is_current(home: Path, entry: Path) -> bool:
+    stamp = home / _CACHE_KEY
+    if not stamp.is_file() or stamp.read_text(encoding="utf-8").strip() != entry.name:
+        return False
+    products = _load_products(entry)
+    return products is not None and _has_products(home, products)
+
+
+def _build_entry(home: Path, entry: Path, pfile: Path, cores: int, log: Path) -> Result[None]:
+    before = _snapshot(home)
+    try:
+        run_prep(pfile, cores=cores, log=log)
+    except (OSError, subprocess.SubprocessError) as e:
+        return Err(e)
+    after = _snapshot(home)
+    products = {k: v[0] for k, v in after.items() if before.get(k) != v}
+    if not products:
+        return Err(RuntimeError(f"run_prep wrote nothing to {home}, see {log}"))
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=f".{entry.name[:12]}."))
+    for k in products:
+        shutil.copyfile(home / k, tmp / k)
+    (tmp / _PRODUCTS).write_text(json.dumps(products, indent=1), encoding="utf-8")
+    shutil.rmtree(entry, ignore_errors=True)
+    tmp.rename(entry)
+    return Ok(None)
+
+
+def _restore(home: Path, entry: Path, pfile: Path, cores: int, log: Path) -> Result[bool]:
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(entry.parent / f"{entry.name}.lock"):
+        products = _load_products(entry)
+        ran = products is None
+        if products is None:
+            match _build_entry(home, entry, pfile, cores, log):
+                case Ok(): ...  # fmt: skip
+                case Err(e):
+                    return Err(e)
+            products = _load_products(entry) or {}
+        for k in products:
+            atomic_copy(entry / k, home / k)
+    atomic_write_text(home / _CACHE_KEY, entry.name)
+    return Ok(ran)
+
+
+def ensure_prep(prob: ProblemDef, pfile: Path, key: str, *, cores: int, log: Path) -> Result[bool]:
+    """Run `run_prep` for `pfile` unless products for the same `key` are cached.
+
+    Products are the files `run_prep` creates or changes in the output path of the PFile,
+    `<output_dir>/<prefix>`. They are kept under `<output_dir>/.prep-cache/<key>`, built once
+    per key under an inter-process lock, and copied into the output path of every problem with
+    that key, so concurrent runs never share or overwrite each other's products.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        The problem `pfile` was generated for.
+    pfile: Path
+        PFile to preprocess if no cached products exist.
+    key: str
+        Cache key, see `prep_key`.
+    cores: int
+        Number of cores for `run_prep`.
+    log: Path
+        Log file for `run_prep`.
+
+    Returns
+    -------
+    Result[bool]
+        Ok(True) if `run_prep` was run, Ok(False) if cached products were reused; Err if
+        `run_prep` failed or wrote nothing, in which case nothing is cached.
+
+    """
+    home = prob["output_dir"] / prob["prefix"]
+    entry = prob["output_dir"] / _CACHE_DIR / key
+    ran = False
+    if not _is_current(home, entry):
+        match _restore(home, entry, pfile, cores, log):
+            case Ok(ran): ...  # fmt: skip
+            case Err(e):
+                return Err(e)
+    return Ok(ran)
@@ -0,0 +1,122 @@
+import re
+from typing import TYPE_CHECKING
+
+from code_pkg.components import STATE_VARIABLES
+from code_pkg.io import atomic_write_text
+from code_pkg.types import RestartPoint
+
+from ._manifest import TRACE_FILES, probe_trace
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from code_pkg.types import ProblemDef
+
+_STASH_SUFFIX = ".restart"
+_STEP_PATTERN = re.compile(rf"{STATE_VARIABLES[0]}-(\d+)\.D")
+
+
+def _is_consistent(file: Path) -> bool:
+    # CHeart variable files start with a "<nodes> <dim>" header row
+    probe = probe_trace(file)
+    if probe is None or probe["size"] == 0:
+        return False
+    with file.open("rb") as f:
+        header = f.readline().split()
+    if not header or not header[0].isdigit():
+        return False
+    return probe["rows"] == int(header[0]) + 1
+
+
+def _trace_rows(prob: ProblemDef, step: int) -> int:
+    return step - prob["time"]["start"] + 1
+
+
+def find_checkpoint(prob: ProblemDef) -> RestartPoint | None:
+    """Return the newest step with a complete set of state variables and pressure traces.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        Problem whose output directory is searched for checkpoint files.
+
+    Returns
+    -------
+    RestartPoint | None
+        None if no consistent checkpoint exists.
+
+    """
+    home = prob["output_dir"] / prob["prefix"]
+    if not home.is_dir():
+        return None
+    steps = sorted(
+        (int(m.group(1)) for f in home.iterdir() if (m := _STEP_PATTERN.fullmatch(f.name))),
+        reverse=True,
+    )
+    traces = [probe_trace(home / name) for name in TRACE_FILES.values()]
+    available = min((t["rows"] if t else 0) for t in traces)
+    for step in steps:
+        if not prob["time"]["start"] <= step < prob["time"]["end"]:
+            continue
+        if _trace_rows(prob, step) > available:
+            continue
+        if all(_is_consistent(home / f"{v}-{step}.D") for v in STATE_VARIABLES):
+            return RestartPoint(home, step)
+    return None
+
+
+def _row_key(line: bytes) -> float:
+    return float(line.split(maxsplit=1)[0])
+
+
+def _read_rows(file: Path) -> list[bytes]:
+    if not file.is_file():
+        return []
+    data = file.read_bytes()
+    # drop a row that was only partially written when the run was killed
+    complete = data[: data.rfind(b"\n") + 1]
+    return [ln + b"\n" for ln in complete.splitlines() if ln.strip()]
+
+
+def merge_traces(prob: ProblemDef) -> None:
+    """Prepend the rows stashed before a restart to the traces written by the restarted run.
+
+    Rows of the restarted run whose time does not exceed the last stashed row are dropped, so
+    the merged traces never contain duplicate steps. This is a no-op without a stash.
+    """
+    home = prob["output_dir"] / prob["prefix"]
+    for name in TRACE_FILES.values():
+        trace = home / name
+        stash = home / f"{name}{_STASH_SUFFIX}"
+        if not stash.is_file():
+            continue
+        head = _read_rows(stash)
+        last = _row_key(head[-1]) if head else float("-inf")
+        tail = [ln for ln in _read_rows(trace) if _row_key(ln) > last]
+        atomic_write_text(trace, b"".join(head + tail).decode("utf-8"))
+        stash.unlink()
+
+
+def prepare_restart(prob: ProblemDef) -> RestartPoint | None:
+    """Find the newest checkpoint and stash the trace rows up to it for `merge_traces`.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        Problem to resume.
+
+    Returns
+    -------
+    RestartPoint | None
+        The checkpoint to restart from, None if the run has to start from the beginning.
+
+    """
+    merge_traces(prob)
+    point = find_checkpoint(prob)
+    if point is None:
+        return None
+    rows = _trace_rows(prob, point.step)
+    for name in TRACE_FILES.values():
+        head = _read_rows(point.home / name)[:rows]
+        atomic_write_text(point.home / f"{name}{_STASH_SUFFIX}", b"".join(head).decode("utf-8"))
+    return point
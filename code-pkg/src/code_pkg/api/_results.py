@@ -0,0 +1,157 @@
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+from typing import TYPE_CHECKING, cast
+
+from code_pkg.components import DEFAULT_DISCRETISATION, DEFAULT_IO_PROFILE
+from code_pkg.io import atomic_copy, atomic_write_text, hash_def
+from pfiles.pfile_inflation import resolve_solver
+
+from ._manifest import TRACE_FILES, CompletionManifest
+
+if TYPE_CHECKING:
+    from code_pkg.types import ProblemDef
+
+RESULT_KEY = ".result-key"
+_CACHE_DIR = ".result-cache"
+_NEUTRAL_PREFIX = "result"
+
+
+def _normalise(obj: object) -> object:
+    match obj:
+        case bool() | str():
+            return obj
+        case int():
+            return float(obj)
+        case Mapping():
+            return {k: _normalise(v) for k, v in obj.items()}  # pyright: ignore[reportUnknownVariableType]
+        case Sequence():
+            return [_normalise(v) for v in obj]  # pyright: ignore[reportUnknownVariableType]
+        case _:
+            return obj
+
+
+def normalise_def(prob: ProblemDef) -> dict[str, object]:
+    """Return the physics of a problem, independent of its name, location and spelling.
+
+    Prefix, output directory and mesh (identified by its installed key instead) are dropped,
+    optional settings are replaced by their resolved values and integers by floats, so
+    `{"k": (30000,)}` and `{"k": (30000.0,)}` are the same problem.
+
+    Returns
+    -------
+    dict[str, object]
+        JSON-compatible definition for `hash_def`.
+
+    """
+    dfn = {
+        "time": prob["time"],
+        "loading": prob["loading"],
+        "material": prob["material"],
+        "discretisation": prob.get("discretisation", DEFAULT_DISCRETISATION),
+        "io": prob.get("io", DEFAULT_IO_PROFILE),
+        "solver": resolve_solver(prob),
+    }
+    return {k: _normalise(v) for k, v in dfn.items()}
+
+
+def neutral_problem(prob: ProblemDef) -> ProblemDef:
+    """Return `prob` renamed, with float material parameters, for rendering a comparable PFile.
+
+    Returns
+    -------
+    ProblemDef
+        Problem whose PFile depends neither on its location nor on how `k` was spelled.
+
+    """
+    material = {**prob["material"], "k": tuple(float(k) for k in prob["material"]["k"])}
+    return cast(
+        "ProblemDef",
+        {**prob, "prefix": _NEUTRAL_PREFIX, "output_dir": Path(), "material": material},
+    )
+
+
+def result_key(prob: ProblemDef, pfile_text: str, mesh_key: str) -> str:
+    """Hash the normalised problem with the PFile generated for it and the installed mesh.
+
+    Parameters
+    ----------
+    prob: ProblemDef
+        The problem, see `normalise_def`.
+    pfile_text: str
+        PFile of `neutral_problem(prob)`, so changes of the generating code change the key.
+    mesh_key: str
+        Key of the installed mesh, see `code_pkg.mesh.api.ensure_mesh`.
+
+    Returns
+    -------
+    str
+        Key shared by every problem whose results are identical.
+
+    """
+    return hash_def({"problem": normalise_def(prob), "mesh": mesh_key}, pfile_text.encode())
+
+
+def read_result_key(prob: ProblemDef) -> str | None:
+    stamp = prob["output_dir"] / prob["prefix"] / RESULT_KEY
+    return stamp.read_text(encoding="utf-8").strip() if stamp.is_file() else None
+
+
+def stamp_result_key(prob: ProblemDef, key: str) -> None:
+    atomic_write_text(prob["output_dir"] / prob["prefix"] / RESULT_KEY, key)
+
+
+def _is_done(prob: ProblemDef) -> bool:
+    return CompletionManifest(prob["output_dir"]).update([prob])[prob["prefix"]]["status"] == "done"
+
+
+class ResultCache:
+    """Completed runs indexed by result key, stored as `<output_dir>/.result-cache/<key>`.
+
+    Each entry names the run that produced the results. A run is current only if its
+    `.result-key` stamp matches and its traces are complete; entries whose run has since been
+    redone with another key, or removed, are ignored.
+    """
+
+    __slots__ = ("_dir",)
+
+    def __init__(self, output_dir: Path) -> None:
+        self._dir = output_dir / _CACHE_DIR
+
+    def _source(self, prob: ProblemDef, key: str) -> ProblemDef | None:
+        entry = self._dir / key
+        if not entry.is_file():
+            return None
+        source: ProblemDef = {**prob, "prefix": entry.read_text(encoding="utf-8").strip()}
+        if source["prefix"] == prob["prefix"]:
+            return None
+        return source if read_result_key(source) == key and _is_done(source) else None
+
+    def record(self, prob: ProblemDef, key: str) -> None:
+        """Stamp a completed run with `key` and make its results available to other runs."""
+        stamp_result_key(prob, key)
+        self._dir.mkdir(parents=True, exist_ok=True)
+        atomic_write_text(self._dir / key, prob["prefix"])
+
+    def reuse(self, prob: ProblemDef, key: str) -> str | None:
+        """Find results for `prob`, copying the traces of another run with the same key.
+
+        Runs without a stamp predate result keys; their inputs are unknown, so they are stale.
+
+        Returns
+        -------
+        str | None
+            Prefix of the run holding the results, `prob["prefix"]` if its own are current;
+            None if it has to be run.
+
+        """
+        if read_result_key(prob) == key and _is_done(prob):
+            self.record(prob, key)
+            return prob["prefix"]
+        if (source := self._source(prob, key)) is None:
+            return None
+        home, src = prob["output_dir"] / prob["prefix"], source["output_dir"] / source["prefix"]
+        home.mkdir(parents=True, exist_ok=True)
+        for name in TRACE_FILES.values():
+            atomic_copy(src / name, home / name)
+        stamp_result_key(prob, key)
+        return source["prefix"]
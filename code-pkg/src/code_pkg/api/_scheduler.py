@@ -0,0 +1,150 @@
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import TYPE_CHECKING, NamedTuple, Self
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
+    from types import TracebackType
+
+
+class JobRecord(NamedTuple):
+    name: str
+    cores: int
+    memory: float
+    submitted: float
+    started: float
+    finished: float
+
+
+class UtilisationReport(NamedTuple):
+    cores: int
+    wall_time: float
+    busy_core_time: float
+    jobs: list[JobRecord]
+
+    @property
+    def utilisation(self) -> float:
+        if self.wall_time <= 0.0:
+            return 0.0
+        return self.busy_core_time / (self.cores * self.wall_time)
+
+    def __str__(self) -> str:
+        return (
+            f"{len(self.jobs)} jobs on {self.cores} cores in {self.wall_time:.1f}s, "
+            f"utilisation {100.0 * self.utilisation:.1f}%"
+        )
+
+
+class _Job[R](NamedTuple):
+    name: str
+    fn: Callable[[], R]
+    cores: int
+    memory: float
+    submitted: float
+    future: Future[R]
+
+
+class CoreScheduler:
+    """Run jobs concurrently within a total core (and optional memory) budget.
+
+    Queued jobs are started in submission order whenever they fit in the free budget; when a
+    job finishes, any later job that fits the released cores is started right away, so short
+    or small jobs backfill cores that a large job at the head of the queue cannot use yet.
+    """
+
+    __slots__ = (
+        "_cond",
+        "_free_cores",
+        "_free_memory",
+        "_pending",
+        "_records",
+        "_running",
+        "_start",
+        "cores",
+        "memory",
+    )
+
+    def __init__(self, cores: int | None = None, memory: float | None = None) -> None:
+        self.cores = cores or os.process_cpu_count() or 1
+        self.memory = memory
+        self._free_cores = self.cores
+        self._free_memory = memory if memory is not None else float("inf")
+        self._pending: deque[_Job[object]] = deque()
+        self._running = 0
+        self._records: list[JobRecord] = []
+        self._cond = threading.Condition()
+        self._start: float | None = None
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.wait()
+
+    def submit[R](
+        self, fn: Callable[[], R], *, cores: int = 1, memory: float = 0.0, name: str = ""
+    ) -> Future[R]:
+        if cores > self.cores:
+            msg = f"Job {name} needs {cores} cores but the budget is {self.cores}"
+            raise ValueError(msg)
+        if self.memory is not None and memory > self.memory:
+            msg = f"Job {name} needs {memory} memory but the budget is {self.memory}"
+            raise ValueError(msg)
+        future: Future[R] = Future()
+        with self._cond:
+            if self._start is None:
+                self._start = time.perf_counter()
+            self._pending.append(_Job(name, fn, cores, memory, time.perf_counter(), future))  # pyright: ignore[reportArgumentType]
+            self._dispatch()
+        return future
+
+    def _dispatch(self) -> None:
+        for job in list(self._pending):
+            if job.cores > self._free_cores or job.memory > self._free_memory:
+                continue
+            self._pending.remove(job)
+            self._free_cores -= job.cores
+            self._free_memory -= job.memory
+            self._running += 1
+            threading.Thread(target=self._execute, args=(job,), name=job.name).start()
+
+    def _execute(self, job: _Job[object]) -> None:
+        started = time.perf_counter()
+        if job.future.set_running_or_notify_cancel():
+            try:
+                job.future.set_result(job.fn())
+            except Exception as e:  # noqa: BLE001
+                job.future.set_exception(e)
+        with self._cond:
+            self._records.append(
+                JobRecord(
+                    job.name, job.cores, job.memory, job.submitted, started, time.perf_counter()
+                )
+            )
+            self._free_cores += job.cores
+            self._free_memory += job.memory
+            self._running -= 1
+            self._dispatch()
+            self._cond.notify_all()
+
+    def wait(self) -> None:
+        with self._cond:
+            self._cond.wait_for(lambda: not self._pending and self._running == 0)
+
+    def report(self) -> UtilisationReport:
+        with self._cond:
+            records = list(self._records)
+            start = self._start
+        if start is None or not records:
+            return UtilisationReport(self.cores, 0.0, 0.0, records)
+        wall = max(r.finished for r in records) - start
+        busy = sum(r.cores * (r.finished - r.started) for r in records)
+        return UtilisationReport(self.cores, wall, busy, records)
@@ -0,0 +1,143 @@
+import math
+import os
+import signal
+import subprocess  # noqa: S404
+import threading
+import time
+from typing import TYPE_CHECKING, TypedDict, Unpack
+
+from ._logs import FileTail
+
+if TYPE_CHECKING:
+    from collections.abc import Sequence
+    from pathlib import Path
+
+
+class WatchdogDef(TypedDict, total=False):
+    max_abs: float
+    stall: float
+    grace: float
+    poll: float
+    kill_after: float
+
+
+def _check_rows(rows: Sequence[bytes], max_abs: float) -> str | None:
+    for row in rows:
+        try:
+            values = [float(v) for v in row.split()]
+        except ValueError:
+            return f"unreadable row {row!r}"
+        if not all(math.isfinite(v) for v in values):
+            return f"non-finite value in row {row.decode(errors='replace')}"
+        if any(abs(v) > max_abs for v in values[1:]):
+            return f"pressure exceeds {max_abs:g} in row {row.decode(errors='replace')}"
+    return None
+
+
+class Watchdog(threading.Thread):
+    """Tail the pressure traces of a running solver and kill its process group on divergence.
+
+    The solver is terminated if a row holds NaN/Inf, a pressure above `max_abs`, or if no
+    trace has grown for `stall` seconds after the initial `grace` period.
+    """
+
+    def __init__(
+        self, proc: subprocess.Popen[bytes], files: Sequence[Path], **kwargs: Unpack[WatchdogDef]
+    ) -> None:
+        super().__init__(daemon=True, name=f"watchdog-{proc.pid}")
+        self.proc = proc
+        self.reason: str | None = None
+        self._tails = [FileTail(f) for f in files]
+        self._max_abs = kwargs.get("max_abs", 1.0e7)
+        self._stall = kwargs.get("stall", 900.0)
+        self._grace = kwargs.get("grace", 600.0)
+        self._poll = kwargs.get("poll", 5.0)
+        self._kill_after = kwargs.get("kill_after", 30.0)
+        self._done = threading.Event()
+
+    def stop(self) -> None:
+        self._done.set()
+
+    def _inspect(self, start: float, last_growth: float) -> tuple[str | None, float]:
+        now = time.monotonic()
+        for tail in self._tails:
+            rows = tail.read_rows()
+            if rows:
+                last_growth = now
+            if (reason := _check_rows(rows, self._max_abs)) is not None:
+                return f"{tail.file.name}: {reason}", last_growth
+        if now - start > self._grace and now - last_growth > self._stall:
+            return f"no new output for {now - last_growth:.0f}s", last_growth
+        return None, last_growth
+
+    def _terminate(self) -> None:
+        try:
+            os.killpg(self.proc.pid, signal.SIGTERM)
+            self.proc.wait(timeout=self._kill_after)
+        except subprocess.TimeoutExpired:
+            os.killpg(self.proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+
+    def run(self) -> None:
+        start = last_growth = time.monotonic()
+        while not self._done.wait(self._poll):
+            if self.proc.poll() is not None:
+                return
+            reason, last_growth = self._inspect(start, last_growth)
+            if reason is not None:
+                self.reason = reason
+                self._terminate()
+                return
+
+
+def solver_command(pfile: Path, cores: int) -> list[str]:
+    return ["mpiexec", "-n", str(cores), "cheartsolver.out", str(pfile)]
+
+
+def run_problem_watched(
+    pfile: Path,
+    traces: Sequence[Path],
+    *,
+    cores: int,
+    log: Path,
+    watchdog: WatchdogDef,
+) -> str | None:
+    """Run the solver in its own process group under a `Watchdog`.
+
+    Parameters
+    ----------
+    pfile: Path
+        PFile to solve.
+    traces: Sequence[Path]
+        Trace files written by the solver that are monitored.
+    cores: int
+        Number of MPI ranks.
+    log: Path
+        File receiving the solver's stdout and stderr.
+    watchdog: WatchdogDef
+        Thresholds of the watchdog.
+
+    Returns
+    -------
+    str | None
+        The reason the solver was killed, None if it exited on its own.
+
+    """
+    with log.open("w", encoding="utf-8") as f:
+        proc = subprocess.Popen(
+            solver_command(pfile, cores),
+            stdout=f,
+            stderr=subprocess.STDOUT,
+            start_new_session=True,
+        )
+        dog = Watchdog(proc, traces, **watchdog)
+        dog.start()
+        try:
+            proc.wait()
+        finally:
+            dog.stop()
+            dog.join()
+            if proc.poll() is None:
+                os.killpg(proc.pid, signal.SIGKILL)
+    return dog.reason
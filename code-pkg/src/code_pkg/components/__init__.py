@@ -1,18 +1,40 @@
-from .bc import create_bcpatches
-from .core import create_fluid_variables, create_problem_topology, create_solid_variables
+from .bc import (
+    create_ale_bcpatches,
+    create_bcpatches,
+    create_fluid_bcpatches,
+    create_solid_bcpatches,
+)
+from .core import (
+    DEFAULT_DISCRETISATION,
+    DEFAULT_IO_PROFILE,
+    IO_PROFILES,
+    STATE_VARIABLES,
+    create_fluid_variables,
+    create_problem_topology,
+    create_solid_variables,
+    resolve_io,
+)
 from .fluid import create_ale_problem, create_fluid_problem
 from .interface import create_interface_coupling_problem
 from .postprocessing import create_pressure_calculation
 from .solid import create_solid_problem
 
 __all__ = [
+    "DEFAULT_DISCRETISATION",
+    "DEFAULT_IO_PROFILE",
+    "IO_PROFILES",
+    "STATE_VARIABLES",
+    "create_ale_bcpatches",
     "create_ale_problem",
     "create_bcpatches",
+    "create_fluid_bcpatches",
     "create_fluid_problem",
     "create_fluid_variables",
     "create_interface_coupling_problem",
     "create_pressure_calculation",
     "create_problem_topology",
+    "create_solid_bcpatches",
     "create_solid_problem",
     "create_solid_variables",
+    "resolve_io",
 ]
@@ -16,7 +16,7 @@ from code_pkg.types import (
 if TYPE_CHECKING:
     from collections.abc import Sequence
 
-    from cheartpy.fe.trait import IExpression
+    from cheartpy.fe.trait import IBCPatch, IExpression
 
     from code_pkg.types import FluidVariables, SolidVariables, TopDef
 
@@ -85,21 +85,37 @@ def create_jet_curve(dfn: LoadingSpaceDef, fvars: FluidVariables) -> IExpression
             )
 
 
-def create_bcpatches(
+def create_fluid_bcpatches(
     mesh: TopDef,
     dfn: LoadingDef,
-    svars: SolidVariables,
     fvars: FluidVariables,
-) -> BCPatches:
+) -> list[IBCPatch]:
     time_curve = create_time_curve(dfn["time"])
     space_curve = create_jet_curve(dfn["space"], fvars)
     inlet_vel = create_expr("inlet_flow_vel", [0, f"{time_curve}*{space_curve}"])
     inlet_vel.add_deps(time_curve, space_curve)
+    return [create_bcpatch(mesh["fluid_bcpatch"]["inlet"], fvars.V, "dirichlet", inlet_vel)]
+
+
+def create_solid_bcpatches(mesh: TopDef, svars: SolidVariables) -> list[IBCPatch]:
+    return [create_bcpatch(mesh["solid_bcpatch"]["inlet"], svars.V, "dirichlet", 0.0, 0.0)]
+
+
+def create_ale_bcpatches(mesh: TopDef, fvars: FluidVariables) -> list[IBCPatch]:
+    return [
+        create_bcpatch(mesh["fluid_bcpatch"]["inlet"], fvars.W, "dirichlet", 0.0, 0.0),
+        create_bcpatch(mesh["fluid_bcpatch"]["interface"], fvars.W, "dirichlet", fvars.V),
+    ]
+
+
+def create_bcpatches(
+    mesh: TopDef,
+    dfn: LoadingDef,
+    svars: SolidVariables,
+    fvars: FluidVariables,
+) -> BCPatches:
     return BCPatches(
-        solid=[create_bcpatch(mesh["solid_bcpatch"]["inlet"], svars.V, "dirichlet", 0.0, 0.0)],
-        fluid=[create_bcpatch(mesh["fluid_bcpatch"]["inlet"], fvars.V, "dirichlet", inlet_vel)],
-        ale=[
-            create_bcpatch(mesh["fluid_bcpatch"]["inlet"], fvars.W, "dirichlet", 0.0, 0.0),
-            create_bcpatch(mesh["fluid_bcpatch"]["interface"], fvars.W, "dirichlet", fvars.V),
-        ],
+        solid=create_solid_bcpatches(mesh, svars),
+        fluid=create_fluid_bcpatches(mesh, dfn, fvars),
+        ale=create_ale_bcpatches(mesh, fvars),
     )
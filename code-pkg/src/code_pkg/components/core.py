@@ -1,4 +1,5 @@
-from typing import TypedDict, Unpack
+import math
+from typing import TYPE_CHECKING, Literal, TypedDict, Unpack
 
 from cheartpy.fe.api import (
     create_basis,
@@ -8,17 +9,64 @@ from cheartpy.fe.api import (
     create_variable,
 )
 
-from code_pkg.types import FluidVariables, ProblemTopology, SolidVariables, TopDef
+from code_pkg.types import (
+    DiscretisationDef,
+    FluidVariables,
+    IODef,
+    ProblemTopology,
+    RestartPoint,
+    SolidVariables,
+    TopDef,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Mapping
+    from pathlib import Path
+
+    from cheartpy.fe.trait import ICheartTopology, IVariable
+
+    from code_pkg.types import IOProfile
 
 _INT2STR = {0: "const", 1: "lin", 2: "quad"}
+STATE_VARIABLES = ("FluidXt", "FluidV", "FluidP", "FluidW", "SolidV", "SolidU", "SolidP")
+DEFAULT_DISCRETISATION = DiscretisationDef(gp=6, pressure_order=1)
+DEFAULT_IO_PROFILE: IOProfile = "traces-only"
+IO_PROFILES: Mapping[IOProfile, IODef] = {
+    "traces-only": IODef(fmt="TXT", freq=-1),
+    "fields-every-50": IODef(fmt="TXT", freq=50),
+    "full-binary": IODef(fmt="BINARY", freq=1),
+}
+
+
+def resolve_io(profile: IOProfile | None, checkpoint: int = -1) -> IODef:
+    """Return the format and output frequency of field variables for an IO profile.
+
+    With checkpoints, state variables are written every `gcd(freq, checkpoint)` steps so both
+    the profile's and the checkpoint steps are exported.
 
+    Returns
+    -------
+    IODef
+        Format and frequency for `create_fluid_variables` and `create_solid_variables`.
 
-def create_problem_topology(mesh: TopDef) -> ProblemTopology:
+    """
+    dfn = IO_PROFILES[profile or DEFAULT_IO_PROFILE]
+    if checkpoint <= 0:
+        return dfn
+    freq = checkpoint if dfn["freq"] <= 0 else math.gcd(dfn["freq"], checkpoint)
+    return IODef(fmt=dfn["fmt"], freq=freq)
+
+
+def create_problem_topology(
+    mesh: TopDef, dfn: DiscretisationDef = DEFAULT_DISCRETISATION
+) -> ProblemTopology:
+    gp = dfn["gp"]
     solidbasis = {
-        i: create_basis(mesh["solid"][i]["elem"], "NL", i, quadrature="GL", gp=6) for i in [1, 2]
+        i: create_basis(mesh["solid"][i]["elem"], "NL", i, quadrature="GL", gp=gp) for i in [1, 2]
     }
     fluidbasis = {
-        i: create_basis(mesh["fluid"][i]["elem"], "NL", i, quadrature="GL", gp=6) for i in [0, 1, 2]
+        i: create_basis(mesh["fluid"][i]["elem"], "NL", i, quadrature="GL", gp=gp)
+        for i in [0, 1, 2]
     }
     bndbasis = create_boundary_basis(solidbasis[2])
     solidtops = {
@@ -94,34 +142,50 @@ def create_problem_topology(mesh: TopDef) -> ProblemTopology:
         inlet=inlettop,
         apex=apextop,
         bnd=fsitop,
+        fluid_pressure=fluidtops[dfn["pressure_order"]],
     )
 
 
 class _Kwargs(TypedDict, total=False):
     freq: int
+    fmt: Literal["TXT", "BINARY"]
+    restart: RestartPoint | None
+
+
+def _create_state_variable(
+    name: str,
+    top: ICheartTopology,
+    dim: int,
+    data: Path | str | None = None,
+    **kwargs: Unpack[_Kwargs],
+) -> IVariable:
+    restart = kwargs.get("restart")
+    if restart is not None:
+        data = restart.home / f"{name}-{restart.step}.D"
+    return create_variable(
+        name, top, dim, data=data, freq=kwargs.get("freq", -1), fmt=kwargs.get("fmt", "TXT")
+    )
 
 
 def create_fluid_variables(top: ProblemTopology, **kwargs: Unpack[_Kwargs]) -> FluidVariables:
     prefix = "Fluid"
-    _freq = kwargs.get("freq", -1)
-    xt = create_variable(f"{prefix}Xt", top.fluid1, 2, data=top.fluid1.mesh, freq=_freq)
+    xt = _create_state_variable(f"{prefix}Xt", top.fluid1, 2, data=top.fluid1.mesh, **kwargs)
     x0 = create_variable(f"{prefix}X0", top.fluid1, 2, data=top.fluid1.mesh, freq=-1)
     return FluidVariables(
         Xt=xt,
         X0=x0,
-        V=create_variable(f"{prefix}V", top.fluid2, 2, freq=_freq),
-        P=create_variable(f"{prefix}P", top.fluid1, 1, freq=_freq),
-        W=create_variable(f"{prefix}W", top.fluid1, 2, freq=_freq),
+        V=_create_state_variable(f"{prefix}V", top.fluid2, 2, **kwargs),
+        P=_create_state_variable(f"{prefix}P", top.fluid_pressure, 1, **kwargs),
+        W=_create_state_variable(f"{prefix}W", top.fluid1, 2, **kwargs),
     )
 
 
 def create_solid_variables(top: ProblemTopology, **kwargs: Unpack[_Kwargs]) -> SolidVariables:
     prefix = "Solid"
-    _freq = kwargs.get("freq", -1)
     x = create_variable(f"{prefix}X", top.solid2, 2, data=top.solid2.mesh, freq=-1)
     return SolidVariables(
         X=x,
-        V=create_variable(f"{prefix}V", top.solid2, 2, freq=_freq),
-        U=create_variable(f"{prefix}U", top.solid2, 2, freq=_freq),
-        P=create_variable(f"{prefix}P", top.solid1, 1, freq=_freq),
+        V=_create_state_variable(f"{prefix}V", top.solid2, 2, **kwargs),
+        U=_create_state_variable(f"{prefix}U", top.solid2, 2, **kwargs),
+        P=_create_state_variable(f"{prefix}P", top.solid1, 1, **kwargs),
     )
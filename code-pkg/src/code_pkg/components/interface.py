@@ -21,7 +21,9 @@ def create_interface_coupling_problem(
 ) -> FSCouplingProblem:
     _fmt = "BINARY" if kwargs.get("binary", False) else "TXT"
     lm = create_variable("IfLM", top.bnd, 2, fmt=_fmt, freq=kwargs.get("freq", -1))
-    xb = create_variable("IfX", top.bnd, 2, data=top.bnd.mesh, freq=kwargs.get("freq", -1))
+    xb = create_variable(
+        "IfX", top.bnd, 2, data=top.bnd.mesh, fmt=_fmt, freq=kwargs.get("freq", -1)
+    )
     p = FSCouplingProblem("InterfaceCouplling", space=xb, root_top=top.bnd)
     p.set_lagrange_mult(lm, FSExpr(fvars.V, 1), FSExpr(svars.V, -1))
     p.add_term(fvars.V, FSExpr(lm, 1))
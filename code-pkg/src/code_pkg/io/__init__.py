@@ -1,3 +1,53 @@
-from ._json import import_problem_def, is_problem_def, iter_problem_defs, parse_problem_def
+from ._bulk import JSON_SUFFIXES, ProblemImport, import_problem_defs
+from ._fs import atomic_copy, atomic_write_text, file_lock
+from ._hash import canonical_json, hash_def
+from ._json import (
+    ParseMemo,
+    TreePath,
+    import_problem_def,
+    is_problem_def,
+    iter_problem_defs,
+    parse_problem_def,
+    walk_problem_defs,
+)
+from ._store import (
+    SweepParams,
+    SweepStore,
+    pack_sweep,
+    params_table,
+    read_pressure_columns,
+    sweep_params,
+)
+from ._sweep import SweepSpec, compile_expression, export_sweep_def, import_sweep_def
+from ._traces import SIDECAR_DIR, clear_trace_cache, load_trace
 
-__all__ = ["import_problem_def", "is_problem_def", "iter_problem_defs", "parse_problem_def"]
+__all__ = [
+    "JSON_SUFFIXES",
+    "SIDECAR_DIR",
+    "ParseMemo",
+    "ProblemImport",
+    "SweepParams",
+    "SweepSpec",
+    "SweepStore",
+    "TreePath",
+    "atomic_copy",
+    "atomic_write_text",
+    "canonical_json",
+    "clear_trace_cache",
+    "compile_expression",
+    "export_sweep_def",
+    "file_lock",
+    "hash_def",
+    "import_problem_def",
+    "import_problem_defs",
+    "import_sweep_def",
+    "is_problem_def",
+    "iter_problem_defs",
+    "load_trace",
+    "pack_sweep",
+    "params_table",
+    "parse_problem_def",
+    "read_pressure_columns",
+    "sweep_params",
+    "walk_problem_defs",
+]
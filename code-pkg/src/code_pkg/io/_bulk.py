@@ -0,0 +1,126 @@
+import itertools
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+from pytools.result import Err, Ok
+
+from ._json import ParseMemo, parse_problem_def
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Iterator
+
+    from code_pkg.types import ProblemDef
+
+JSON_SUFFIXES = (".json", ".jsonl")
+_BATCH = 2048
+_ERRORS_SHOWN = 20
+
+# A definition to parse: its source ("file" or "file:line") and a file to read or JSON text
+type _Item = tuple[str, Path | str]
+
+
+class ProblemImport(NamedTuple):
+    problems: dict[str, ProblemDef]
+    errors: dict[str, Exception]
+
+    def __str__(self) -> str:
+        lines = [f"{len(self.problems)} problems imported, {len(self.errors)} invalid"]
+        lines.extend(
+            f"  {src}: {e}" for src, e in itertools.islice(self.errors.items(), _ERRORS_SHOWN)
+        )
+        if len(self.errors) > _ERRORS_SHOWN:
+            lines.append(f"  ... and {len(self.errors) - _ERRORS_SHOWN} more")
+        return "\n".join(lines)
+
+
+def _parse_item(item: Path | str, memo: ParseMemo) -> ProblemDef | Exception:
+    try:
+        raw = json.loads(item.read_bytes() if isinstance(item, Path) else item)
+    except (OSError, ValueError) as e:
+        return e
+    if not isinstance(raw, dict):
+        return ValueError("Invalid: root of JSON is not a dictionary")
+    if "mesh" in raw:
+        raw["mesh"] = memo.intern(raw["mesh"])
+    match parse_problem_def(raw, memo=memo):
+        case Ok(prob):
+            return prob
+        case Err(e):
+            return e
+
+
+def _parse_batch(batch: list[_Item]) -> list[tuple[str, ProblemDef | Exception]]:
+    memo = ParseMemo()
+    return [(src, _parse_item(item, memo)) for src, item in batch]
+
+
+def _jsonl_items(file: Path, name: str) -> Iterator[_Item]:
+    with file.open(encoding="utf-8") as f:
+        for i, line in enumerate(f, start=1):
+            if line.strip():
+                yield f"{name}:{i}", line
+
+
+def _items(source: Path) -> Iterator[_Item]:
+    if source.is_dir():
+        files = sorted(f for f in source.rglob("*.json*") if f.suffix in JSON_SUFFIXES)
+    else:
+        files, source = [source], source.parent
+    for f in files:
+        name = f.relative_to(source).as_posix()
+        if f.suffix == ".jsonl":
+            yield from _jsonl_items(f, name)
+        else:
+            yield name, f
+
+
+def _batches(items: Iterable[_Item]) -> Iterator[list[_Item]]:
+    it = iter(items)
+    while batch := list(itertools.islice(it, _BATCH)):
+        yield batch
+
+
+def import_problem_defs(source: Path, *, workers: int | None = None) -> ProblemImport:
+    """Import and validate every problem definition of a directory or JSON Lines file.
+
+    A directory is searched recursively for `.json` files, holding one problem each, and
+    `.jsonl` files, holding one problem per line. Definitions are parsed in batches by a pool
+    of processes, each batch checking every distinct output or mesh directory and parsing
+    every distinct mesh once (see `ParseMemo`); a single batch is parsed in this process.
+
+    Parameters
+    ----------
+    source: Path
+        Directory, `.json` or `.jsonl` file.
+    workers: int | None
+        Number of processes, defaults to the number of CPUs available.
+
+    Returns
+    -------
+    ProblemImport
+        Problems and errors keyed by the file, relative to `source`, and line they came from,
+        in file order.
+
+    """
+    batches = list(_batches(_items(source)))
+    workers = os.process_cpu_count() if workers is None else workers
+    if len(batches) <= 1 or workers == 1:
+        return _report(itertools.chain.from_iterable(map(_parse_batch, batches)))
+    with ProcessPoolExecutor(
+        max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+    ) as pool:
+        return _report(itertools.chain.from_iterable(pool.map(_parse_batch, batches)))
+
+
+def _report(parsed: Iterable[tuple[str, ProblemDef | Exception]]) -> ProblemImport:
+    report = ProblemImport({}, {})
+    for src, res in parsed:
+        if isinstance(res, Exception):
+            report.errors[src] = res
+        else:
+            report.problems[src] = res
+    return report
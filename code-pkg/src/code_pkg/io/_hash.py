@@ -0,0 +1,30 @@
+import hashlib
+import json
+from collections.abc import Mapping, Sequence
+from pathlib import Path
+
+
+def _canonical(obj: object) -> object:
+    match obj:
+        case Path():
+            return obj.as_posix()
+        case str() | int() | float() | bool() | None:
+            return obj
+        case Mapping():
+            return {str(k): _canonical(v) for k, v in obj.items()}  # pyright: ignore[reportUnknownVariableType]
+        case Sequence():
+            return [_canonical(v) for v in obj]  # pyright: ignore[reportUnknownVariableType]
+        case _:
+            msg = f"Cannot hash object of type {type(obj).__name__}"
+            raise TypeError(msg)
+
+
+def canonical_json(obj: object) -> str:
+    return json.dumps(_canonical(obj), sort_keys=True, separators=(",", ":"))
+
+
+def hash_def(obj: object, *extra: bytes) -> str:
+    h = hashlib.sha256(canonical_json(obj).encode("utf-8"))
+    for b in extra:
+        h.update(b)
+    return h.hexdigest()
@@ -2,7 +2,7 @@
 from __future__ import annotations
 
 import json
-from collections.abc import Generator, Mapping, Sequence
+from collections.abc import Callable, Generator, Iterable, Iterator, Mapping, Sequence
 from pathlib import Path
 from typing import TYPE_CHECKING, Any, TypeGuard, TypeIs, cast, get_args
 
@@ -11,18 +11,22 @@ from pytools.result import Err, Ok, Result, all_ok
 
 from code_pkg.types import (
     BCPatchDef,
+    DiscretisationDef,
     HoldCurve,
+    IOProfile,
     IsotropicExponentialMaterial,
     LoadingCurveDef,
     LoadingDef,
     LoadingSpaceDef,
     MaterialDef,
+    MatrixCalculation,
     MeshDef,
     NeoHookeanMaterial,
     ParabolicJet,
     ProblemDef,
     RampCurve,
     SineCurve,
+    SolverDef,
     TimeDef,
     TopDef,
 )
@@ -31,6 +35,10 @@ if TYPE_CHECKING:
     from pytools.json import AnyValue
 
 
+def is_io_profile(value: object) -> TypeIs[IOProfile]:
+    return value in get_args(IOProfile.__value__)
+
+
 def is_cheart_element_type(value: object) -> TypeIs[CheartElementType]:
     return value in get_args(CheartElementType)
 
@@ -83,11 +91,16 @@ def _parse_mesh_top_def(mesh_top_dict: AnyValue) -> Result[Mapping[int, MeshDef]
         return Err(ValueError("Invalid: mesh topology definition is not a dictionary"))
     mesh_top: dict[int, MeshDef] = {}
     for k, v in mesh_top_dict.items():
-        if not isinstance(k, int):
-            return Err(ValueError("Invalid: mesh topology keys must be integers"))
+        # JSON object keys are strings
+        match k:
+            case int(order): ...  # fmt: skip
+            case str() if k.isdigit():
+                order = int(k)
+            case _:
+                return Err(ValueError("Invalid: mesh topology keys must be integers"))
         match _parse_mesh_def(v):
             case Ok(mesh_def):
-                mesh_top[k] = mesh_def
+                mesh_top[order] = mesh_def
             case Err(err):
                 return Err(err)
     return Ok(mesh_top)
@@ -117,10 +130,10 @@ def _parse_top_bcpatch_def(bcpatch_dict: AnyValue) -> Result[BCPatchDef]:
     return Ok(BCPatchDef(apex=int(apex), inlet=int(inlet), interface=int(interface)))
 
 
-def _parse_top_def(top_dict: AnyValue) -> Result[TopDef]:
+def _parse_top_def(top_dict: AnyValue, memo: ParseMemo) -> Result[TopDef]:
     if not isinstance(top_dict, dict):
         return Err(ValueError("Invalid: 'mesh' definition is not a dictionary"))
-    match _parse_dir(top_dict.get("home")):
+    match memo.directory(top_dict.get("home")):
         case Ok(home): ...  # fmt: skip
         case Err(err):
             return Err(ValueError(f"Invalid: 'mesh.home' is not a valid path: {err}"))
@@ -217,10 +230,11 @@ def _parse_jet_space_curve(loading_dict: AnyValue) -> Result[LoadingSpaceDef]:
     if not isinstance(loading_dict, dict):
         return Err(ValueError("Invalid: 'loading' definition must be a dictionary"))
     match loading_dict.get("space"):
-        case {"type": "parabolic"}: ...  # fmt: skip
+        case {"type": "parabolic", "width": float(width) | int(width)}: ...  # fmt: skip
         case _:
-            return Err(ValueError("Invalid: 'loading.space' must be 'parabolic'"))
-    return Ok(ParabolicJet(type="parabolic", width=15.0))
+            msg = "Invalid: 'loading.space' must be 'parabolic' with a numeric 'width'"
+            return Err(ValueError(msg))
+    return Ok(ParabolicJet(type="parabolic", width=float(width)))
 
 
 def _parse_loading_def(loading_dict: AnyValue) -> Result[LoadingDef]:
@@ -272,12 +286,58 @@ def _parse_material_def(material_dict: AnyValue) -> Result[MaterialDef]:
             )
 
 
-def parse_problem_def(raw_dict: Mapping[str, Any]) -> Result[ProblemDef]:
+class ParseMemo:
+    """Parse results of objects shared by several problems, such as a common mesh definition.
+
+    Entries are keyed by object identity and keep the object alive, so a memo must only be
+    shared while the parsed definitions are not modified, e.g. for one walk of a sweep.
+    Directory checks are keyed by path, so problems loaded from separate files share them.
+    """
+
+    __slots__ = ("_dirs", "_interned", "_items")
+
+    def __init__(self) -> None:
+        self._items: dict[int, tuple[object, Any]] = {}
+        self._dirs: dict[str, Result[Path]] = {}
+        self._interned: dict[str, AnyValue] = {}
+
+    def intern(self, value: AnyValue) -> AnyValue:
+        """Return the first value seen equal to the JSON value `value`.
+
+        Definitions loaded from separate documents share nothing; interning e.g. their mesh
+        lets the identity-keyed memo parse it once.
+
+        Returns
+        -------
+        AnyValue
+            `value` or an equal value interned before.
+
+        """
+        return self._interned.setdefault(json.dumps(value, sort_keys=True), value)
+
+    def directory(self, path: object | None) -> Result[Path]:
+        if not isinstance(path, str | Path):
+            return _parse_dir(path)
+        if (hit := self._dirs.get(key := str(path))) is None:
+            hit = self._dirs[key] = _parse_dir(path)
+        return hit
+
+    def get[T](self, key: object, parse: Callable[[], T]) -> T:
+        if (hit := self._items.get(id(key))) is None:
+            hit = self._items[id(key)] = (key, parse())
+        return hit[1]
+
+
+def parse_problem_def(
+    raw_dict: Mapping[str, Any], *, memo: ParseMemo | None = None
+) -> Result[ProblemDef]:
+    memo = ParseMemo() if memo is None else memo
     match raw_dict.get("prefix"):
         case str(prefix): ...  # fmt: skip
         case _:
             return Err(ValueError("Invalid: 'prefix' not a valid string"))
-    match _parse_dir(raw_dict.get("output_dir")):
+    output_dir, mesh_dict = raw_dict.get("output_dir"), raw_dict.get("mesh")
+    match memo.directory(output_dir):
         case Ok(path): ...  # fmt: skip
         case Err(err):
             return Err(err)
@@ -285,7 +345,7 @@ def parse_problem_def(raw_dict: Mapping[str, Any]) -> Result[ProblemDef]:
         case Ok(time): ...  # fmt: skip
         case Err(err):
             return Err(err)
-    match _parse_top_def(raw_dict.get("mesh")):
+    match memo.get(mesh_dict, lambda: _parse_top_def(mesh_dict, memo)):
         case Ok(mesh): ...  # fmt: skip
         case Err(err):
             return Err(err)
@@ -297,11 +357,66 @@ def parse_problem_def(raw_dict: Mapping[str, Any]) -> Result[ProblemDef]:
         case Ok(material): ...  # fmt: skip
         case Err(err):
             return Err(err)
-    return Ok(
-        ProblemDef(
-            prefix=prefix, output_dir=path, time=time, mesh=mesh, loading=loading, material=material
-        )
+    prob = ProblemDef(
+        prefix=prefix, output_dir=path, time=time, mesh=mesh, loading=loading, material=material
     )
+    return _parse_options(prob, raw_dict)
+
+
+def _parse_discretisation_def(raw: AnyValue) -> Result[DiscretisationDef]:
+    match raw:
+        case {"gp": int(gp), "pressure_order": 0 | 1 as order} if gp > 0:
+            return Ok(DiscretisationDef(gp=gp, pressure_order=order))
+        case _:
+            msg = "Invalid: 'discretisation' needs a positive 'gp' and a 'pressure_order' of 0 or 1"
+            return Err(ValueError(msg))
+
+
+def _parse_solver_def(raw: AnyValue) -> Result[SolverDef]:
+    if not isinstance(raw, dict):
+        return Err(ValueError("Invalid: 'solver' definition must be a dictionary"))
+    dfn = SolverDef()
+    for k, v in raw.items():
+        match k, v:
+            case "matrix_calculation" | "ale_calculation", str(calc) if calc in get_args(
+                MatrixCalculation.__value__
+            ):
+                dfn[k] = calc
+            case "method", "seq_fp_linesearch" | "seq_fp" as method:
+                dfn["method"] = method
+            case "ale_first", bool(flag):
+                dfn["ale_first"] = flag
+            case "subiterations", int(n) if not isinstance(n, bool) and n > 0:
+                dfn["subiterations"] = n
+            case "subiter_fraction" | "l2tol" | "scale_first_residual", float(x) | int(x) if (
+                not isinstance(x, bool) and x > 0
+            ):
+                dfn[k] = float(x)
+            case _:
+                return Err(ValueError(f"Invalid: 'solver.{k}' = {v!r}"))
+    return Ok(dfn)
+
+
+def _parse_options(prob: ProblemDef, raw_dict: Mapping[str, Any]) -> Result[ProblemDef]:
+    match raw_dict.get("io"):
+        case None: ...  # fmt: skip
+        case str(io) if is_io_profile(io):
+            prob["io"] = io
+        case _:
+            return Err(ValueError(f"Invalid: 'io' must be one of {get_args(IOProfile.__value__)}"))
+    if (raw := raw_dict.get("discretisation")) is not None:
+        match _parse_discretisation_def(raw):
+            case Ok(dfn):
+                prob["discretisation"] = dfn
+            case Err(err):
+                return Err(err)
+    if (raw := raw_dict.get("solver")) is not None:
+        match _parse_solver_def(raw):
+            case Ok(solver):
+                prob["solver"] = solver
+            case Err(err):
+                return Err(err)
+    return Ok(prob)
 
 
 def is_problem_def(raw_dict: object) -> TypeGuard[ProblemDef]:
@@ -341,15 +456,73 @@ def import_problem_def(file: Path) -> Result[ProblemDef]:
 NestedDef = Mapping[Any, "NestedDef"] | Sequence["NestedDef"] | Generator["NestedDef"] | ProblemDef
 
 
+type TreePath = tuple[Any, ...]
+type _Node = tuple[TreePath, object]
+
+
+def _is_leaf(node: object) -> TypeGuard[Mapping[str, Any]]:
+    return isinstance(node, Mapping) and "prefix" in node
+
+
+def _children(node: object) -> Iterator[tuple[Any, object]] | None:
+    match node:
+        case Mapping():
+            return iter(cast("Mapping[Any, object]", node).items())
+        case str() | bytes():
+            return None
+        case Iterable():
+            return enumerate(cast("Iterable[object]", node))
+        case _:
+            return None
+
+
+def _with_path(path: TreePath, children: Iterator[tuple[Any, object]]) -> Generator[_Node]:
+    for k, v in children:
+        yield (*path, k), v
+
+
+def walk_problem_defs(
+    tree: NestedDef, errors: dict[TreePath, Exception] | None = None
+) -> Generator[tuple[TreePath, ProblemDef]]:
+    """Yield every problem of a nested sweep with the keys leading to it, in one pass.
+
+    Mappings with a "prefix" key are leaves and are parsed exactly once; other mappings,
+    sequences and iterators are walked. Output directories and meshes shared between leaves
+    are checked once per walk (see `ParseMemo`), and the tree is walked with an explicit
+    stack, so large or deep sweeps cost time linear in their size.
+
+    Parameters
+    ----------
+    tree: NestedDef
+        Problem, or mappings/sequences/generators of them nested to any depth.
+    errors: dict[TreePath, Exception] | None
+        Receives the error of every invalid leaf; if None, each is reported in one line.
+
+    Yields
+    ------
+    tuple[TreePath, ProblemDef]
+        Keys (mapping keys or sequence indices) from the root to a leaf and its parsed problem.
+
+    """
+    memo = ParseMemo()
+    stack: list[Iterator[_Node]] = [iter([((), tree)])]
+    while stack:
+        for path, node in stack[-1]:
+            if _is_leaf(node):
+                match parse_problem_def(node, memo=memo):
+                    case Ok(prob):
+                        yield path, prob
+                    case Err(e) if errors is not None:
+                        errors[path] = e
+                    case Err(e):
+                        print(f"Skipping invalid problem at {'/'.join(map(str, path))}: {e}")
+            elif (children := _children(node)) is not None:
+                stack.append(_with_path(path, children))
+                break
+        else:
+            stack.pop()
+
+
 def iter_problem_defs(iterable: NestedDef) -> Generator[ProblemDef]:
-    if is_problem_def(iterable):
-        yield iterable
-    elif isinstance(iterable, Mapping):
-        for v in iterable.values():
-            yield from iter_problem_defs(v)  # pyright: ignore[reportArgumentType]
-    elif isinstance(iterable, Sequence):
-        for v in iterable:
-            yield from iter_problem_defs(v)
-    else:
-        for v in iterable:
-            yield from iter_problem_defs(v)
+    for _, prob in walk_problem_defs(iterable):
+        yield prob
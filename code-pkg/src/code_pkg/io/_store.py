@@ -0,0 +1,224 @@
+import os
+import struct
+import tempfile
+import zipfile
+from pathlib import Path
+from typing import TYPE_CHECKING, NamedTuple
+
+import numpy as np
+from pytools.result import Err, Ok, Result
+
+from ._traces import load_trace
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable, Sequence
+
+    from numpy.typing import NDArray
+
+    from code_pkg.types import ProblemDef
+
+_PARAMS = "params.npy"
+_LOCAL_HEADER = struct.Struct("<4s5H3I2H")
+
+
+class SweepParams(NamedTuple):
+    prefix: str
+    width: float
+    frequency: float
+    stiffness: float
+    material: str
+    rows: int
+
+
+def read_pressure_columns(prob: ProblemDef) -> Result[NDArray[np.float64]]:
+    """Read the apex and inlet traces of a run as a (n, 3) array of time, apex and inlet.
+
+    Returns
+    -------
+    Result[NDArray[np.float64]]
+        Err if a trace is missing, unreadable or does not cover the time steps of `prob`.
+
+    """
+    home = prob["output_dir"] / prob["prefix"]
+    match load_trace(home / "apex_pressure-0.D"), load_trace(home / "inlet_pressure-0.D"):
+        case Ok(apex_rows), Ok(inlet_rows):
+            apex, inlet = apex_rows[:, 1], inlet_rows[:, 1]
+        case Err(e), _:
+            return Err(e)
+        case _, Err(e):
+            return Err(e)
+    time = np.arange(prob["time"]["start"], prob["time"]["end"] + 1) * prob["time"]["step"]
+    if len(time) != len(apex) or len(time) != len(inlet):
+        msg = f"Time n={len(time)} does not match {len(apex)}, {len(inlet)} for {prob['prefix']}"
+        return Err(ValueError(msg))
+    return Ok(np.column_stack([time, apex, inlet]))
+
+
+def sweep_params(prob: ProblemDef, rows: int) -> SweepParams:
+    sine = [c for c in prob["loading"]["time"] if c["type"] == "Sine"]
+    return SweepParams(
+        prefix=prob["prefix"],
+        width=prob["loading"]["space"]["width"],
+        frequency=1.0 / sine[0]["period"] if sine else float("nan"),
+        stiffness=prob["material"]["k"][0],
+        material=prob["material"]["type"],
+        rows=rows,
+    )
+
+
+def params_table(rows: Sequence[SweepParams]) -> NDArray[np.void]:
+    width = max((len(r.prefix) for r in rows), default=1)
+    kind = max((len(r.material) for r in rows), default=1)
+    dtype = np.dtype([
+        ("prefix", f"U{width}"),
+        ("width", "f8"),
+        ("frequency", "f8"),
+        ("stiffness", "f8"),
+        ("material", f"U{kind}"),
+        ("rows", "i8"),
+    ])
+    return np.array([tuple(r) for r in rows], dtype=dtype)
+
+
+def _member(i: int) -> str:
+    return f"runs/{i:06d}.npy"
+
+
+def pack_sweep(
+    probs: Iterable[ProblemDef], file: Path, *, compress: bool = False
+) -> dict[str, Exception]:
+    """Pack the pressure traces and parameters of a sweep into a single `.npz` store.
+
+    Every run is one member holding a column-major (n, 3) array of time, apex and inlet, so
+    runs can be read independently. Uncompressed stores are memory-mapped by `SweepStore`;
+    `compress=True` deflates every member, trading random access speed for size. The store
+    is replaced atomically.
+
+    Parameters
+    ----------
+    probs: Iterable[ProblemDef]
+        Runs of the sweep.
+    file: Path
+        The store to write.
+    compress: bool
+        Deflate the members.
+
+    Returns
+    -------
+    dict[str, Exception]
+        Runs that could not be read, which are left out of the store.
+
+    """
+    errors: dict[str, Exception] = {}
+    params: list[SweepParams] = []
+    file.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=file.parent, prefix=f".{file.name}.", suffix=".tmp")
+    mode = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+    with os.fdopen(fd, "wb") as f, zipfile.ZipFile(f, "w", compression=mode) as zf:
+        for prob in probs:
+            match read_pressure_columns(prob):
+                case Ok(data): ...  # fmt: skip
+                case Err(e):
+                    errors[prob["prefix"]] = e
+                    continue
+            with zf.open(_member(len(params)), "w", force_zip64=True) as m:
+                np.lib.format.write_array(m, np.asfortranarray(data))
+            params.append(sweep_params(prob, len(data)))
+        with zf.open(_PARAMS, "w") as m:
+            np.lib.format.write_array(m, params_table(params))
+    Path(tmp).replace(file)
+    return errors
+
+
+class SweepStore:
+    """Read access to a store written by `pack_sweep`.
+
+    Runs are selected by their parameters with `select` and read, optionally restricted to a
+    time window, with `read`. Members of uncompressed stores are memory-mapped, so only the
+    pages of the requested runs are ever read from disk.
+    """
+
+    __slots__ = ("_index", "file", "params")
+
+    def __init__(self, file: Path) -> None:
+        self.file = file
+        with zipfile.ZipFile(file) as zf, zf.open(_PARAMS) as f:
+            self.params: NDArray[np.void] = np.lib.format.read_array(f)
+        self._index = {str(p): i for i, p in enumerate(self.params["prefix"])}
+
+    def __len__(self) -> int:
+        return len(self.params)
+
+    def __contains__(self, prefix: object) -> bool:
+        return prefix in self._index
+
+    @property
+    def prefixes(self) -> list[str]:
+        return list(self._index)
+
+    def record(self, prefix: str) -> SweepParams:
+        row = self.params[self._index[prefix]]
+        return SweepParams(*(v.item() for v in row))
+
+    def select(
+        self,
+        *,
+        width: float | None = None,
+        frequency: float | None = None,
+        stiffness: float | None = None,
+        material: str | None = None,
+    ) -> list[str]:
+        mask = np.ones(len(self.params), dtype=bool)
+        for name, value in (("width", width), ("frequency", frequency), ("stiffness", stiffness)):
+            if value is not None:
+                mask &= np.isclose(self.params[name], value)
+        if material is not None:
+            mask &= self.params["material"] == material
+        return [str(p) for p in self.params["prefix"][mask]]
+
+    def _load(self, i: int) -> NDArray[np.float64]:
+        with zipfile.ZipFile(self.file) as zf:
+            info = zf.getinfo(_member(i))
+            if info.compress_type != zipfile.ZIP_STORED:
+                with zf.open(info) as f:
+                    return np.lib.format.read_array(f)
+        with self.file.open("rb") as f:
+            f.seek(info.header_offset)
+            *_, name_len, extra_len = _LOCAL_HEADER.unpack(f.read(_LOCAL_HEADER.size))
+            f.seek(name_len + extra_len, 1)
+            version = np.lib.format.read_magic(f)
+            match version:
+                case (1, 0):
+                    shape, fortran, dtype = np.lib.format.read_array_header_1_0(f)
+                case _:
+                    shape, fortran, dtype = np.lib.format.read_array_header_2_0(f)
+            offset = f.tell()
+        order = "F" if fortran else "C"
+        return np.memmap(self.file, dtype=dtype, mode="r", offset=offset, shape=shape, order=order)
+
+    def read(
+        self, prefix: str, *, window: tuple[float, float] | None = None
+    ) -> Result[NDArray[np.float64]]:
+        """Return the (n, 3) time, apex and inlet columns of a run.
+
+        Parameters
+        ----------
+        prefix: str
+            The run to read.
+        window: tuple[float, float] | None
+            Only return rows with `window[0] <= time <= window[1]`.
+
+        Returns
+        -------
+        Result[NDArray[np.float64]]
+            Err if the run is not in the store.
+
+        """
+        if prefix not in self._index:
+            return Err(KeyError(f"{prefix} is not in {self.file}"))
+        data = self._load(self._index[prefix])
+        if window is not None:
+            lo = np.searchsorted(data[:, 0], window[0], side="left")
+            hi = np.searchsorted(data[:, 0], window[1], side="right")
+            data = data[lo:hi]
+        return Ok(data)
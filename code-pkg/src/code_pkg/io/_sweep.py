@@ -0,0 +1,265 @@
+import ast
+import copy
+import itertools
+import json
+import math
+import operator
+import string
+from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
+from typing import TYPE_CHECKING, Any, cast, overload
+
+from pytools.result import Err, Ok, Result
+
+from ._fs import atomic_write_text
+from ._hash import canonical_json
+from ._json import parse_problem_def
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from code_pkg.types import ProblemDef, SweepDef, SweepValue
+
+type _Expr = Callable[[Mapping[str, SweepValue]], Any]
+type _FieldPath = tuple[str | int, ...]
+
+_BINARY: Mapping[type[ast.operator], Callable[[Any, Any], Any]] = {
+    ast.Add: operator.add,
+    ast.Sub: operator.sub,
+    ast.Mult: operator.mul,
+    ast.Div: operator.truediv,
+    ast.FloorDiv: operator.floordiv,
+    ast.Mod: operator.mod,
+    ast.Pow: operator.pow,
+}
+_UNARY: Mapping[type[ast.unaryop], Callable[[Any], Any]] = {
+    ast.USub: operator.neg,
+    ast.UAdd: operator.pos,
+}
+_FUNCTIONS: Mapping[str, Callable[..., Any]] = {
+    "abs": abs,
+    "float": float,
+    "int": int,
+    "max": max,
+    "min": min,
+    "round": round,
+    "sqrt": math.sqrt,
+}
+
+
+def _compile_node(node: ast.expr, names: frozenset[str]) -> _Expr:
+    match node:
+        case ast.Constant(value=int() | float() | str() as value):
+            return lambda _: value
+        case ast.Name(id=name) if name in names:
+            return operator.itemgetter(name)
+        case ast.BinOp(left=left, op=op, right=right) if type(op) in _BINARY:
+            fn, lhs, rhs = (
+                _BINARY[type(op)],
+                _compile_node(left, names),
+                _compile_node(right, names),
+            )
+            return lambda v: fn(lhs(v), rhs(v))
+        case ast.UnaryOp(op=op, operand=operand) if type(op) in _UNARY:
+            fn, arg = _UNARY[type(op)], _compile_node(operand, names)
+            return lambda v: fn(arg(v))
+        case ast.Call(func=ast.Name(id=name), args=args, keywords=[]) if name in _FUNCTIONS:
+            fn, params = _FUNCTIONS[name], [_compile_node(a, names) for a in args]
+            return lambda v: fn(*(p(v) for p in params))
+        case _:
+            msg = f"Unsupported sweep expression {ast.unparse(node)!r}"
+            raise ValueError(msg)
+
+
+def compile_expression(expr: str, names: Iterable[str]) -> _Expr:
+    """Compile an arithmetic expression of sweep variables without `eval`.
+
+    Only numbers, strings, the variables `names`, arithmetic operators and the functions
+    abs, float, int, max, min, round and sqrt are accepted.
+
+    Returns
+    -------
+    Callable[[Mapping[str, SweepValue]], Any]
+        Function evaluating the expression for a mapping of variable values.
+
+    Raises
+    ------
+    ValueError
+        If the expression is not valid Python or uses anything else.
+
+    """
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        msg = f"Invalid sweep expression {expr!r}: {e.msg}"
+        raise ValueError(msg) from e
+    return _compile_node(tree.body, frozenset(names))
+
+
+def _field_path(field: str) -> _FieldPath:
+    return tuple(int(k) if k.isdigit() else k for k in field.split("."))
+
+
+def _replace(node: object, path: _FieldPath, value: object) -> object:
+    if not path:
+        return value
+    key, rest = path[0], path[1:]
+    match node, key:
+        case Mapping(), _:
+            node = cast("Mapping[str | int, object]", node)
+            return {**node, key: _replace(node[key], rest, value)}
+        case Sequence(), int():
+            items = list(cast("Sequence[object]", node))
+            items[key] = _replace(items[key], rest, value)
+            return tuple(items) if isinstance(node, tuple) else items
+        case _:
+            msg = f"Cannot set {key!r} of {type(node).__name__}"
+            raise TypeError(msg)
+
+
+class SweepSpec(Sequence["ProblemDef"]):
+    """Lazily expanded parameter sweep over a base problem.
+
+    Each axis maps variable names to equally long value lists that are zipped; the sweep is
+    the cartesian product of its axes, with the first axis outermost. A problem is created
+    only when indexed: its prefix is `prefix` formatted with the variables and every field
+    (a dotted path such as "loading.time.0.max_vel") is set to its expression evaluated on
+    them. Containers along a field path are copied, everything else, e.g. the mesh, is
+    shared with the base. Slices and shards are views over the same definition.
+    """
+
+    __slots__ = ("_axes", "_fields", "_sizes", "dfn", "indices")
+
+    def __init__(self, dfn: SweepDef) -> None:
+        self.dfn = dfn
+        self._axes: list[tuple[tuple[str, ...], list[tuple[SweepValue, ...]]]] = []
+        for axis in dfn["axes"]:
+            if len(lengths := {len(v) for v in axis.values()}) != 1 or 0 in lengths:
+                msg = f"Sweep axis {list(axis)} must have values of one non-zero length"
+                raise ValueError(msg)
+            self._axes.append((tuple(axis), list(zip(*axis.values(), strict=True))))
+        names = [n for axis_names, _ in self._axes for n in axis_names]
+        if len(set(names)) != len(names):
+            msg = f"Sweep variables {names} are not unique"
+            raise ValueError(msg)
+        used = {f for _, f, _, _ in string.Formatter().parse(dfn["prefix"]) if f is not None}
+        if not used <= set(names):
+            msg = f"Sweep prefix {dfn['prefix']!r} must only use the variables {names}"
+            raise ValueError(msg)
+        # prefixes are unique only if every axis with several values appears in them
+        if missing := [a for a, rows in self._axes if len(rows) > 1 and not used & set(a)]:
+            msg = f"Sweep prefix {dfn['prefix']!r} must use a variable of each axis {missing}"
+            raise ValueError(msg)
+        self._fields = [
+            (_field_path(k), compile_expression(v, names)) for k, v in dfn.get("fields", {}).items()
+        ]
+        self._sizes = [len(rows) for _, rows in self._axes]
+        self.indices = range(math.prod(self._sizes))
+
+    def _view(self, indices: range) -> SweepSpec:
+        view = copy.copy(self)
+        view.indices = indices
+        return view
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __repr__(self) -> str:
+        return f"SweepSpec({self.dfn['prefix']!r}, {len(self)} of {math.prod(self._sizes)})"
+
+    def variables(self, index: int) -> dict[str, SweepValue]:
+        """Return the variable values of the problem at `index` of this view.
+
+        Returns
+        -------
+        dict[str, SweepValue]
+            Value of every variable of every axis.
+
+        """
+        i, values = self.indices[index], {}
+        for (names, rows), size in zip(reversed(self._axes), reversed(self._sizes), strict=True):
+            i, r = divmod(i, size)
+            values.update(zip(names, rows[r], strict=True))
+        return values
+
+    def _expand(self, values: Mapping[str, SweepValue]) -> ProblemDef:
+        prob: object = {**self.dfn["base"], "prefix": self.dfn["prefix"].format(**values)}
+        for path, expr in self._fields:
+            prob = _replace(prob, path, expr(values))
+        return cast("ProblemDef", prob)
+
+    @overload
+    def __getitem__(self, index: int) -> ProblemDef: ...
+    @overload
+    def __getitem__(self, index: slice) -> SweepSpec: ...
+    def __getitem__(self, index: int | slice) -> ProblemDef | SweepSpec:
+        if isinstance(index, slice):
+            return self._view(self.indices[index])
+        return self._expand(self.variables(index))
+
+    def __iter__(self) -> Iterator[ProblemDef]:
+        for i in range(len(self)):
+            yield self[i]
+
+    def shard(self, i: int, n: int) -> SweepSpec:
+        """Return every `n`-th problem starting at `i`, the `i`-th of `n` disjoint shards.
+
+        Returns
+        -------
+        SweepSpec
+            View over the shard.
+
+        """
+        return self[i::n]
+
+    def groups(self, inner: int = 1) -> Iterator[list[ProblemDef]]:
+        """Yield the problems that differ only in the last `inner` axes together.
+
+        Yields
+        ------
+        list[ProblemDef]
+            Problems of one combination of the outer axes, in sweep order.
+
+        """
+        size = math.prod(self._sizes[len(self._sizes) - inner :])
+        for _, group in itertools.groupby(range(len(self)), key=lambda i: self.indices[i] // size):
+            yield [self[i] for i in group]
+
+
+def export_sweep_def(spec: SweepSpec | SweepDef, file: Path) -> None:
+    """Write a sweep definition as JSON, readable by `import_sweep_def`."""
+    dfn = spec.dfn if isinstance(spec, SweepSpec) else spec
+    atomic_write_text(file, json.dumps(json.loads(canonical_json(dfn)), indent=2) + "\n")
+
+
+def import_sweep_def(file: Path) -> Result[SweepSpec]:
+    """Return a sweep parsed from a JSON file.
+
+    The base problem is validated like `import_problem_def`; axes and fields are checked by
+    `SweepSpec`.
+
+    Returns
+    -------
+    Result[SweepSpec]
+        Ok(SweepSpec) if the file was successfully parsed, Err otherwise.
+
+    """
+    with file.open("r", encoding="utf-8") as f:
+        raw: Any = json.load(f)
+    match raw:
+        case {"base": dict(base), "prefix": str(prefix), "axes": list(axes)}: ...  # fmt: skip
+        case _:
+            return Err(ValueError("Invalid: sweep needs a 'base', a 'prefix' and a list of 'axes'"))
+    match raw.get("fields", {}):
+        case dict(fields) if all(isinstance(v, str) for v in fields.values()): ...  # fmt: skip
+        case _:
+            return Err(ValueError("Invalid: sweep 'fields' must map paths to expressions"))
+    if not all(isinstance(a, dict) and all(isinstance(v, list) for v in a.values()) for a in axes):
+        return Err(ValueError("Invalid: every sweep axis must map names to lists of values"))
+    match parse_problem_def(base):
+        case Ok(prob): ...  # fmt: skip
+        case Err(err):
+            return Err(err)
+    try:
+        return Ok(SweepSpec({"base": prob, "prefix": prefix, "axes": axes, "fields": fields}))
+    except ValueError as e:
+        return Err(e)
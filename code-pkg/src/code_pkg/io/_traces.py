@@ -0,0 +1,86 @@
+import functools
+import json
+import os
+import tempfile
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+import numpy as np
+from pytools.result import Err, Ok, Result
+
+from ._fs import atomic_write_text
+
+if TYPE_CHECKING:
+    from numpy.typing import NDArray
+
+SIDECAR_DIR = ".traces"
+_CACHE_SIZE = 512
+
+
+def _sidecar(file: Path) -> tuple[Path, Path]:
+    home = file.parent / SIDECAR_DIR
+    return home / f"{file.name}.npy", home / f"{file.name}.json"
+
+
+def _write_sidecar(file: Path, data: NDArray[np.float64], size: int, mtime_ns: int) -> None:
+    npy, stamp = _sidecar(file)
+    npy.parent.mkdir(exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=npy.parent, prefix=f".{npy.name}.", suffix=".tmp")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, data)
+    Path(tmp).replace(npy)
+    atomic_write_text(stamp, json.dumps({"size": size, "mtime_ns": mtime_ns}))
+
+
+def _read_sidecar(file: Path, size: int, mtime_ns: int) -> NDArray[np.float64] | None:
+    npy, stamp = _sidecar(file)
+    if not (npy.is_file() and stamp.is_file()):
+        return None
+    try:
+        meta = json.loads(stamp.read_text(encoding="utf-8"))
+    except json.JSONDecodeError:
+        return None
+    if meta != {"size": size, "mtime_ns": mtime_ns}:
+        return None
+    return np.load(npy, mmap_mode="r")
+
+
+@functools.lru_cache(maxsize=_CACHE_SIZE)
+def _load(file: Path, size: int, mtime_ns: int) -> NDArray[np.float64]:
+    if (data := _read_sidecar(file, size, mtime_ns)) is not None:
+        return data
+    data = np.loadtxt(file, dtype=np.float64, ndmin=2)
+    _write_sidecar(file, data, size, mtime_ns)
+    return np.load(_sidecar(file)[0], mmap_mode="r")
+
+
+def load_trace(file: Path) -> Result[NDArray[np.float64]]:
+    """Return the rows of a text trace, parsing it at most once per change of the file.
+
+    Parsed traces are kept as a memory-mapped `.npy` sidecar in `<dir>/.traces/`, stamped with
+    the source size and mtime, and in an in-process LRU keyed by the same stamp, so an edited
+    or rewritten trace is parsed again while an unchanged one never is.
+
+    Parameters
+    ----------
+    file: Path
+        Whitespace separated text file, one row per time step.
+
+    Returns
+    -------
+    Result[NDArray[np.float64]]
+        Ok(read-only 2D array) or Err if the file is missing or cannot be parsed.
+
+    """
+    try:
+        stat = file.stat()
+    except FileNotFoundError:
+        return Err(FileNotFoundError(f"Missing trace file {file}"))
+    try:
+        return Ok(_load(file, stat.st_size, stat.st_mtime_ns))
+    except ValueError as e:
+        return Err(ValueError(f"Cannot parse {file}: {e}"))
+
+
+def clear_trace_cache() -> None:
+    _load.cache_clear()
@@ -1,22 +1,36 @@
+import functools
+import hashlib
 import importlib.resources
+import shutil
+import tempfile
+from pathlib import Path
 from typing import TYPE_CHECKING
 
 from cheartpy.mesh.api import import_cheart_mesh
 from pytools.result import Err, Ok, Result
 
 import code_pkg.mesh.data.ventricle_2d
+from code_pkg.io import atomic_copy, atomic_write_text, file_lock, hash_def
 
 from ._surface import create_apex_surface
 
 if TYPE_CHECKING:
     from code_pkg.types import TopDef
 
+APEX_RADIUS = 2.5
+_CACHE_DIR = ".mesh-cache"
+_CACHE_KEY = ".mesh-key"
+_CACHE_LOCK = ".mesh.lock"
 
-def remake_mesh(dfn: TopDef) -> Result[None]:
+
+def remake_mesh(
+    dfn: TopDef, *, home: Path | None = None, radius: float = APEX_RADIUS
+) -> Result[None]:
+    home = dfn["home"] if home is None else home
     with importlib.resources.path(code_pkg.mesh.data.ventricle_2d) as path:
         fluid = import_cheart_mesh(path / "fluid")
         solid = import_cheart_mesh(path / "solid")
-    dfn["home"].mkdir(exist_ok=True)
+    home.mkdir(exist_ok=True)
     match fluid:
         case Ok(mesh):
             ...
@@ -26,15 +40,91 @@ def remake_mesh(dfn: TopDef) -> Result[None]:
         mesh,
         in_surf=dfn["fluid_bcpatch"]["interface"],
         label=dfn["fluid_bcpatch"]["apex"],
-        radius=2.5,
+        radius=radius,
     ):
         case Ok(new_mesh):
-            new_mesh.save(dfn["home"] / dfn["fluid"][1]["name"])
+            new_mesh.save(home / dfn["fluid"][1]["name"])
         case Err(err):
             return Err(err)
     match solid:
         case Ok(mesh):
-            mesh.save(dfn["home"] / dfn["solid"][1]["name"])
+            mesh.save(home / dfn["solid"][1]["name"])
         case Err(err):
             return Err(err)
     return Ok(None)
+
+
+@functools.cache
+def _source_digest() -> str:
+    src = importlib.resources.files(code_pkg.mesh.data.ventricle_2d)
+    h = hashlib.sha256()
+    for f in sorted((f for f in src.iterdir() if f.is_file()), key=lambda f: f.name):
+        h.update(f.name.encode("utf-8"))
+        h.update(f.read_bytes())
+    return h.hexdigest()
+
+
+def mesh_cache_key(dfn: TopDef, radius: float = APEX_RADIUS) -> str:
+    top = {k: v for k, v in dfn.items() if k != "home"}
+    return hash_def({"mesh": top, "radius": radius}, _source_digest().encode("utf-8"))
+
+
+def _is_current(home: Path, key: str) -> bool:
+    stamp = home / _CACHE_KEY
+    entry = home / _CACHE_DIR / key
+    if not stamp.is_file() or not entry.is_dir():
+        return False
+    if stamp.read_text(encoding="utf-8").strip() != key:
+        return False
+    return all((home / f.name).is_file() for f in entry.iterdir())
+
+
+def _build_entry(dfn: TopDef, entry: Path, radius: float) -> Result[None]:
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = Path(tempfile.mkdtemp(dir=entry.parent, prefix=f".{entry.name[:12]}."))
+    match remake_mesh(dfn, home=tmp, radius=radius):
+        case Ok(_):
+            tmp.rename(entry)
+            return Ok(None)
+        case Err(err):
+            shutil.rmtree(tmp, ignore_errors=True)
+            return Err(err)
+
+
+def ensure_mesh(dfn: TopDef, *, radius: float = APEX_RADIUS) -> Result[str]:
+    """Install the mesh for `dfn` into its home, building it at most once per input hash.
+
+    Built meshes are kept under `home/.mesh-cache/<key>` and copied into `home` atomically
+    while holding an inter-process lock, so concurrent runs never see partially written files.
+
+    Parameters
+    ----------
+    dfn: TopDef
+        Mesh topology definition; `dfn["home"]` is the shared mesh directory.
+    radius: float
+        Radius of the apex surface patch.
+
+    Returns
+    -------
+    Result[str]
+        Ok(key) with the cache key of the installed mesh, Err if the mesh could not be built.
+
+    """
+    home = dfn["home"]
+    key = mesh_cache_key(dfn, radius)
+    if _is_current(home, key):
+        return Ok(key)
+    home.mkdir(parents=True, exist_ok=True)
+    with file_lock(home / _CACHE_LOCK):
+        if _is_current(home, key):
+            return Ok(key)
+        entry = home / _CACHE_DIR / key
+        if not entry.is_dir():
+            match _build_entry(dfn, entry, radius):
+                case Ok(_): ...  # fmt: skip
+                case Err(err):
+                    return Err(err)
+        for f in entry.iterdir():
+            atomic_copy(f, home / f.name)
+        atomic_write_text(home / _CACHE_KEY, key)
+    return Ok(key)
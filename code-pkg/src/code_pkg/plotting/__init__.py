@@ -1,10 +1,40 @@
+from ._downsample import Downsample, downsample
 from ._pressure import (
+    REFERENCE_TAG,
+    PressureData,
+    import_pressure_data,
+    is_reference,
+    pressure_diff_all_figure,
+    pressure_diff_figure,
+    pressure_oscillations_normalized_figure,
     summarize_pressure_diff,
     summarize_pressure_diff_all,
     summarize_pressure_oscillations_normalized,
 )
+from ._render import (
+    FigureJob,
+    RenderReport,
+    render_figure,
+    render_figures,
+)
+from ._stream import SummaryPipeline, references_first
 
 __all__ = [
+    "REFERENCE_TAG",
+    "Downsample",
+    "FigureJob",
+    "PressureData",
+    "RenderReport",
+    "SummaryPipeline",
+    "downsample",
+    "import_pressure_data",
+    "is_reference",
+    "pressure_diff_all_figure",
+    "pressure_diff_figure",
+    "pressure_oscillations_normalized_figure",
+    "references_first",
+    "render_figure",
+    "render_figures",
     "summarize_pressure_diff",
     "summarize_pressure_diff_all",
     "summarize_pressure_oscillations_normalized",
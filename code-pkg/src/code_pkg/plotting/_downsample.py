@@ -0,0 +1,90 @@
+from typing import TYPE_CHECKING, Literal
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from pytools.arrays import A1
+
+type Downsample = Literal["minmax", "lttb"]
+
+_MIN_POINTS = 3
+
+
+def minmax_indices(y: A1[np.floating], bins: int) -> A1[np.intp]:
+    """Return the first, last, minimum and maximum sample index of `bins` chunks of `y`.
+
+    Returns
+    -------
+    A1[np.intp]
+        Sorted indices, at most `2 * bins + 2` of them.
+
+    """
+    n = len(y)
+    if n <= 2 * bins + 2:
+        return np.arange(n)
+    chunk = -(-n // bins)
+    padded = np.concatenate([y, np.full(chunk * bins - n, y[-1])]).reshape(bins, chunk)
+    base = np.arange(bins) * chunk
+    # all-NaN chunks, e.g. after a run diverged, keep only their first sample
+    empty = np.isnan(padded).all(axis=1)
+    padded[empty] = 0.0
+    idx = np.concatenate([
+        base + np.nanargmin(padded, axis=1),
+        base + np.nanargmax(padded, axis=1),
+        [0, n - 1],
+    ])
+    return np.unique(np.minimum(idx, n - 1))
+
+
+def lttb_indices(x: A1[np.floating], y: A1[np.floating], points: int) -> A1[np.intp]:
+    """Select `points` sample indices by Largest-Triangle-Three-Buckets.
+
+    Returns
+    -------
+    A1[np.intp]
+        Sorted indices, including the first and last sample.
+
+    """
+    n = len(y)
+    if points >= n or points < _MIN_POINTS:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.intp)
+    out = np.empty(points, dtype=np.intp)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nxt = slice(hi, edges[i + 2] if i + 2 < len(edges) else n)
+        cx, cy = x[nxt].mean(), y[nxt].mean()
+        area = np.abs((x[a] - cx) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (cy - y[a]))
+        a = out[i + 1] = lo + int(np.argmax(area))
+    return out
+
+
+def downsample[F: np.floating](
+    x: A1[F], y: A1[F], columns: int, method: Downsample
+) -> tuple[A1[F], A1[F]]:
+    """Reduce a trace to about two samples per pixel column, keeping its extrema.
+
+    Parameters
+    ----------
+    x, y: A1[F]
+        The trace, with `x` increasing.
+    columns: int
+        Width of the axes in pixels.
+    method: Downsample
+        "minmax" keeps the minimum and maximum of every column, which preserves the envelope
+        exactly; "lttb" keeps the visually most significant `2 * columns` samples.
+
+    Returns
+    -------
+    tuple[A1[F], A1[F]]
+        The downsampled trace.
+
+    """
+    match method:
+        case "minmax":
+            idx = minmax_indices(y, columns)
+        case "lttb":
+            idx = lttb_indices(x, y, 2 * columns)
+    return x[idx], y[idx]
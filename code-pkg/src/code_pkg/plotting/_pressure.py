@@ -1,54 +1,32 @@
 # pyright: reportUnknownMemberType=false
 
 import os
-from collections.abc import Iterable, Mapping, Sequence
-from typing import TYPE_CHECKING, NamedTuple, TypedDict, Unpack
+from typing import TYPE_CHECKING, NamedTuple, Unpack
 
 import numpy as np
-from pytools.plotting.api import (
-    close_figure,
-    create_figure,
-    update_figure_setting,
-)
 from pytools.result import Err, Ok, Result, filter_ok
 
+from code_pkg.io import read_pressure_columns
+
+from ._render import FigureJob, render_figure
+
 if TYPE_CHECKING:
-    from pathlib import Path
+    from collections.abc import Iterable
 
     from pytools.arrays import A1, DType
     from pytools.plotting.trait import PlotKwargs
 
     from code_pkg._data import ProblemDef
+    from code_pkg.io import SweepStore
 
-
-class PlotData[F: np.floating](TypedDict, total=True):
-    x: A1[F]
-    y: A1[F]
+    from ._downsample import Downsample
 
 
-_TOO_TALL = 3
+REFERENCE_TAG = "1000kPa"
 
 
-def plot_time_trace[F: np.floating](
-    data: Sequence[PlotData[F]] | Mapping[str, PlotData[F]],
-    fout: Path,
-    **kwargs: Unpack[PlotKwargs],
-) -> None:
-    kwargs = {**kwargs}
-    fig, ax = create_figure(**kwargs)
-    update_figure_setting(fig, **kwargs)
-    match data:
-        case Sequence():
-            for d in data:
-                ax.plot(d["x"], d["y"])
-        case Mapping():
-            for k, v in data.items():
-                ax.plot(v["x"], v["y"], label=k)
-            ax.legend() if len(data) <= _TOO_TALL else fig.legend(
-                loc="outside lower center", ncol=_TOO_TALL
-            )
-    fig.savefig(fout)
-    close_figure(fig)
+def is_reference(prefix: str) -> bool:
+    return REFERENCE_TAG in prefix
 
 
 class PressureData[F: np.floating](NamedTuple):
@@ -58,56 +36,70 @@ class PressureData[F: np.floating](NamedTuple):
 
 
 def import_pressure_data[F: np.floating](
-    prob: ProblemDef, *, dtype: DType[F] = np.float64
+    prob: ProblemDef, *, dtype: DType[F] = np.float64, store: SweepStore | None = None
 ) -> Result[PressureData[F]]:
-    apex_file = prob["output_dir"] / prob["prefix"] / "apex_pressure-0.D"
-    inlet_file = prob["output_dir"] / prob["prefix"] / "inlet_pressure-0.D"
-    apex = np.loadtxt(apex_file)[:, 1]
-    inlet = np.loadtxt(inlet_file)[:, 1]
-    time = np.arange(prob["time"]["start"], prob["time"]["end"] + 1) * prob["time"]["step"]
-    if len(time) != len(apex) or len(time) != len(inlet):
-        msg = f"Time n={len(time)} does not match {len(apex)}, {len(inlet)} for {prob['prefix']}"
-        return Err(ValueError(msg))
-    return Ok(PressureData(time.astype(dtype), apex.astype(dtype), inlet.astype(dtype)))
-
-
-def summarize_pressure_diff(prob: ProblemDef) -> None:
-    match import_pressure_data(prob):
+    columns = read_pressure_columns(prob) if store is None else store.read(prob["prefix"])
+    match columns:
         case Ok(data): ...  # fmt: skip
         case Err(e):
-            print(e)
-            return
-    plot_time_trace(
-        {
-            "Apex": {"x": data.time, "y": data.apex},
-            "Inlet": {"x": data.time, "y": data.inlet},
-            "Inlet - Apex": {"x": data.time, "y": data.inlet - data.apex},
-        },
-        fout=prob["output_dir"] / f"{prob['prefix']}-pressure_diff.png",
-        xlabel="Time [s]",
-        ylabel="Pressure [Pa]",
-    )
+            return Err(e)
+    time, apex, inlet = data.T.astype(dtype)
+    return Ok(PressureData(time, apex, inlet))
 
 
-def summarize_pressure_diff_all(probs: Iterable[ProblemDef], **kwargs: Unpack[PlotKwargs]) -> None:
-    prefixes = [p["prefix"] for p in probs]
-    prefix = os.path.commonprefix(prefixes)
-    output_dir = next(iter(probs))["output_dir"]
-    raw = {prob["prefix"]: import_pressure_data(prob) for prob in probs}
-    for prefix, res in raw.items():
+def _import_all(
+    probs: Iterable[ProblemDef], store: SweepStore | None
+) -> dict[str, PressureData[np.float64]]:
+    raw = {prob["prefix"]: import_pressure_data(prob, store=store) for prob in probs}
+    for k, res in raw.items():
         match res:
             case Ok(_): ...  # fmt: skip
             case Err(e):
-                print(f"Failed to import {prefix}: {e}")
-    data = filter_ok(raw)
+                print(f"Failed to import {k}: {e}")
+    return filter_ok(raw)
+
+
+def pressure_diff_figure(
+    prob: ProblemDef, *, store: SweepStore | None = None, downsample: Downsample | None = None
+) -> Result[FigureJob[np.float64]]:
+    match import_pressure_data(prob, store=store):
+        case Ok(data): ...  # fmt: skip
+        case Err(e):
+            return Err(e)
+    return Ok(
+        FigureJob(
+            {
+                "Apex": {"x": data.time, "y": data.apex},
+                "Inlet": {"x": data.time, "y": data.inlet},
+                "Inlet - Apex": {"x": data.time, "y": data.inlet - data.apex},
+            },
+            fout=prob["output_dir"] / f"{prob['prefix']}-pressure_diff.png",
+            kwargs={"xlabel": "Time [s]", "ylabel": "Pressure [Pa]"},
+            downsample=downsample,
+        )
+    )
+
+
+def pressure_diff_all_figure(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = None,
+    **kwargs: Unpack[PlotKwargs],
+) -> Result[FigureJob[np.float64]]:
+    prefix = os.path.commonprefix([p["prefix"] for p in probs])
+    output_dir = next(iter(probs))["output_dir"]
+    data = _import_all(probs, store)
     if not data:
-        print(f"No data found for {prefix} to plot.")
-        return
+        return Err(ValueError(f"No data found for {prefix} to plot."))
     kwargs = {"xlabel": "Time [s]", "ylabel": "Inlet - Apex [Pa]", **kwargs}
-    plot_time_trace(
-        {k.split("_")[-1]: {"x": v.time, "y": v.inlet - v.apex} for k, v in data.items()},
-        fout=output_dir / f"{prefix}pressure_diff_all.png",
-        **kwargs,
+    return Ok(
+        FigureJob(
+            {k.split("_")[-1]: {"x": v.time, "y": v.inlet - v.apex} for k, v in data.items()},
+            fout=output_dir / f"{prefix}pressure_diff_all.png",
+            kwargs=kwargs,
+            downsample=downsample,
+        )
     )
 
 
@@ -116,35 +108,70 @@ class DPData[F: np.floating](NamedTuple):
     v: A1[F]
 
 
-def summarize_pressure_oscillations_normalized(
-    probs: Iterable[ProblemDef], **kwargs: Unpack[PlotKwargs]
-) -> None:
-    prefixes = [p["prefix"] for p in probs]
-    prefix = os.path.commonprefix(prefixes)
+def pressure_oscillations_normalized_figure(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = None,
+    **kwargs: Unpack[PlotKwargs],
+) -> Result[FigureJob[np.float64]]:
+    prefix = os.path.commonprefix([p["prefix"] for p in probs])
     output_dir = next(iter(probs))["output_dir"]
-    raw = {prob["prefix"]: import_pressure_data(prob) for prob in probs}
-    for prefix, res in raw.items():
-        match res:
-            case Ok(_): ...  # fmt: skip
-            case Err(e):
-                print(f"Failed to import {prefix}: {e}")
-    data = filter_ok(raw)
+    data = _import_all(probs, store)
     if not data:
-        print(f"No data found for {prefix} to plot.")
-        return
-    ref_response = {k: v for k, v in data.items() if "1000kPa" in k}
+        return Err(ValueError(f"No data found for {prefix} to plot."))
+    ref_response = {k: v for k, v in data.items() if is_reference(k)}
     if len(ref_response) != 1:
-        print(f"Expected exactly one reference response with '1000kPa', found {len(ref_response)}.")
-        return
+        msg = f"Expected exactly one reference response with '{REFERENCE_TAG}'"
+        return Err(ValueError(f"{msg}, found {len(ref_response)}."))
     ref = next(iter(ref_response.values()))
-    test_responses = {k: v for k, v in data.items() if "1000kPa" not in k}
+    test_responses = {k: v for k, v in data.items() if not is_reference(k)}
     diff_res = {
         k: DPData(v.time, (v.inlet - v.apex) - (ref.inlet - ref.apex))
         for k, v in test_responses.items()
     }
     diff_res = {k: DPData(v.time, v.v / v.v.max()) for k, v in diff_res.items()}
-    plot_time_trace(
-        {k.split("_")[-1]: {"x": v.time, "y": v.v} for k, v in diff_res.items()},
-        fout=output_dir / f"{prefix}pressure_diff_normalized.png",
-        **kwargs,
+    return Ok(
+        FigureJob(
+            {k.split("_")[-1]: {"x": v.time, "y": v.v} for k, v in diff_res.items()},
+            fout=output_dir / f"{prefix}pressure_diff_normalized.png",
+            kwargs=kwargs,
+            downsample=downsample,
+        )
+    )
+
+
+def _render_or_report(figure: Result[FigureJob[np.float64]]) -> None:
+    match figure:
+        case Ok(job):
+            render_figure(job)
+        case Err(e):
+            print(e)
+
+
+def summarize_pressure_diff(
+    prob: ProblemDef, *, store: SweepStore | None = None, downsample: Downsample | None = None
+) -> None:
+    _render_or_report(pressure_diff_figure(prob, store=store, downsample=downsample))
+
+
+def summarize_pressure_diff_all(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = None,
+    **kwargs: Unpack[PlotKwargs],
+) -> None:
+    _render_or_report(pressure_diff_all_figure(probs, store=store, downsample=downsample, **kwargs))
+
+
+def summarize_pressure_oscillations_normalized(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = None,
+    **kwargs: Unpack[PlotKwargs],
+) -> None:
+    _render_or_report(
+        pressure_oscillations_normalized_figure(probs, store=store, downsample=downsample, **kwargs)
     )
@@ -0,0 +1,190 @@
+# pyright: reportUnknownMemberType=false
+
+import multiprocessing
+from collections.abc import Mapping, Sequence
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import TYPE_CHECKING, Literal, NamedTuple, TypedDict, Unpack
+
+import matplotlib as mpl
+import numpy as np
+from pytools.plotting.api import (
+    close_figure,
+    create_figure,
+    update_figure_setting,
+)
+
+from code_pkg.io import atomic_write_text, hash_def
+
+from ._downsample import downsample as _downsample
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+    from pathlib import Path
+
+    from pytools.arrays import A1
+    from pytools.plotting.trait import PlotKwargs
+
+    from ._downsample import Downsample
+
+type RenderStatus = Literal["rendered", "skipped"]
+
+_TOO_TALL = 3
+_STAMP_SUFFIX = ".hash"
+
+
+class PlotData[F: np.floating](TypedDict, total=True):
+    x: A1[F]
+    y: A1[F]
+
+
+def plot_time_trace[F: np.floating](
+    data: Sequence[PlotData[F]] | Mapping[str, PlotData[F]],
+    fout: Path,
+    *,
+    downsample: Downsample | None = None,
+    **kwargs: Unpack[PlotKwargs],
+) -> None:
+    kwargs = {**kwargs}
+    fig, ax = create_figure(**kwargs)
+    update_figure_setting(fig, **kwargs)
+    columns = int(np.ceil(fig.get_size_inches()[0] * fig.dpi))
+
+    def _xy(d: PlotData[F]) -> tuple[A1[F], A1[F]]:
+        if downsample is None:
+            return d["x"], d["y"]
+        return _downsample(np.asarray(d["x"]), np.asarray(d["y"]), columns, downsample)
+
+    match data:
+        case Sequence():
+            for d in data:
+                ax.plot(*_xy(d))
+        case Mapping():
+            for k, v in data.items():
+                ax.plot(*_xy(v), label=k)
+            ax.legend() if len(data) <= _TOO_TALL else fig.legend(
+                loc="outside lower center", ncol=_TOO_TALL
+            )
+    fig.savefig(fout)
+    close_figure(fig)
+
+
+class FigureJob[F: np.floating](NamedTuple):
+    data: Sequence[PlotData[F]] | Mapping[str, PlotData[F]]
+    fout: Path
+    kwargs: PlotKwargs
+    downsample: Downsample | None = None
+
+
+class RenderReport(NamedTuple):
+    rendered: int
+    skipped: int
+    failed: Mapping[str, str]
+
+    def __str__(self) -> str:
+        lines = [f"{self.rendered} rendered, {self.skipped} skipped, {len(self.failed)} failed"]
+        lines.extend(f"  {k}: {v}" for k, v in self.failed.items())
+        return "\n".join(lines)
+
+
+def figure_hash(job: FigureJob[np.floating]) -> str:
+    """Hash the plotted arrays, labels, output name and plot kwargs of a figure.
+
+    Returns
+    -------
+    str
+        Key stored next to the rendered figure, see `render_figure`.
+
+    """
+    series = job.data.items() if isinstance(job.data, Mapping) else enumerate(job.data)
+    labels: list[str] = []
+    arrays: list[bytes] = []
+    for k, v in series:
+        labels.append(str(k))
+        for a in (np.asarray(v["x"]), np.asarray(v["y"])):
+            arrays.extend((f"{a.dtype.str}{a.shape}".encode(), np.ascontiguousarray(a).tobytes()))
+    meta = {
+        "fout": job.fout.name,
+        "labels": labels,
+        "downsample": str(job.downsample),
+        "kwargs": {k: repr(v) for k, v in sorted(job.kwargs.items())},
+    }
+    return hash_def(meta, *arrays)
+
+
+def _stamp(fout: Path) -> Path:
+    return fout.with_name(f".{fout.name}{_STAMP_SUFFIX}")
+
+
+def _is_current(fout: Path, key: str) -> bool:
+    stamp = _stamp(fout)
+    if not (fout.is_file() and stamp.is_file()):
+        return False
+    return stamp.read_text(encoding="utf-8") == key
+
+
+def _plot(job: FigureJob[np.floating]) -> None:
+    plot_time_trace(job.data, job.fout, downsample=job.downsample, **job.kwargs)
+
+
+def render_figure(job: FigureJob[np.floating]) -> RenderStatus:
+    """Render `job` in this process unless its output is current with its inputs.
+
+    Returns
+    -------
+    RenderStatus
+        "skipped" if the figure and its stamp match the hash of the inputs.
+
+    """
+    key = figure_hash(job)
+    if _is_current(job.fout, key):
+        return "skipped"
+    _plot(job)
+    atomic_write_text(_stamp(job.fout), key)
+    return "rendered"
+
+
+def _headless() -> None:
+    mpl.use("Agg")
+
+
+def render_figures(
+    jobs: Iterable[FigureJob[np.floating]], *, workers: int | None = None
+) -> RenderReport:
+    """Render figures in a pool of processes using the Agg backend.
+
+    Figures whose output exists with a stamp matching `figure_hash` are skipped; the stamp of
+    every rendered figure is written once it was saved, so failed figures are retried.
+
+    Parameters
+    ----------
+    jobs: Iterable[FigureJob]
+        Figures to render.
+    workers: int | None
+        Number of processes, defaults to the number of CPUs.
+
+    Returns
+    -------
+    RenderReport
+        Counts of rendered and skipped figures and the error of every failed one.
+
+    """
+    figures = list(jobs)
+    pending = [(j, key) for j in figures if not _is_current(j.fout, key := figure_hash(j))]
+    skipped = len(figures) - len(pending)
+    failed: dict[str, str] = {}
+    rendered = 0
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_headless,
+        ) as pool:
+            futures = {pool.submit(_plot, job): (job, key) for job, key in pending}
+            for future in as_completed(futures):
+                job, key = futures[future]
+                if (e := future.exception()) is not None:
+                    failed[str(job.fout)] = f"{type(e).__name__}: {e}"
+                    continue
+                atomic_write_text(_stamp(job.fout), key)
+                rendered += 1
+    return RenderReport(rendered, skipped, failed)
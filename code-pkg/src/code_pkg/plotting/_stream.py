@@ -0,0 +1,95 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Self
+
+from ._pressure import is_reference, summarize_pressure_diff
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Sequence
+    from concurrent.futures import Future
+    from types import TracebackType
+
+    from code_pkg.types import ProblemDef
+
+
+def _report_failure(future: Future[None]) -> None:
+    if (e := future.exception()) is not None:
+        print(f"Summary failed: {type(e).__name__}: {e}")
+
+
+def references_first(groups: Iterable[Iterable[ProblemDef]]) -> list[ProblemDef]:
+    probs = [p for g in groups for p in g]
+    return [p for p in probs if is_reference(p["prefix"])] + [
+        p for p in probs if not is_reference(p["prefix"])
+    ]
+
+
+class SummaryPipeline:
+    """Plot each run as soon as it completes and each group as soon as all its runs have.
+
+    Plots are rendered one at a time on a single worker thread, since matplotlib is not
+    thread-safe, so `complete` can be called from any scheduler thread. Groups that never fully
+    complete are plotted with the runs that did when the pipeline is closed.
+    """
+
+    __slots__ = (
+        "_done",
+        "_executor",
+        "_fired",
+        "_groups",
+        "_lock",
+        "_on_group",
+        "_on_run",
+        "_probs",
+    )
+
+    def __init__(
+        self,
+        groups: Iterable[Iterable[ProblemDef]],
+        on_group: Callable[[Sequence[ProblemDef]], None],
+        on_run: Callable[[ProblemDef], None] = summarize_pressure_diff,
+    ) -> None:
+        self._groups = [list(g) for g in groups]
+        self._probs = {p["prefix"]: p for g in self._groups for p in g}
+        self._on_group = on_group
+        self._on_run = on_run
+        self._done: set[str] = set()
+        self._fired: set[int] = set()
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="summary")
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_value: BaseException | None,
+        traceback: TracebackType | None,
+    ) -> None:
+        self.close()
+
+    def _submit[T](self, fn: Callable[[T], None], arg: T) -> None:
+        self._executor.submit(fn, arg).add_done_callback(_report_failure)
+
+    def _submit_group(self, i: int, members: Sequence[ProblemDef]) -> None:
+        self._fired.add(i)
+        self._submit(self._on_group, members)
+
+    def complete(self, prefix: str) -> None:
+        with self._lock:
+            if prefix in self._done or prefix not in self._probs:
+                return
+            self._done.add(prefix)
+            self._submit(self._on_run, self._probs[prefix])
+            for i, group in enumerate(self._groups):
+                if i not in self._fired and all(p["prefix"] in self._done for p in group):
+                    self._submit_group(i, group)
+
+    def close(self) -> None:
+        with self._lock:
+            for i, group in enumerate(self._groups):
+                members = [p for p in group if p["prefix"] in self._done]
+                if i not in self._fired and members:
+                    self._submit_group(i, members)
+        self._executor.shutdown(wait=True)
@@ -1,21 +1,29 @@
 from ._data import (
     BCPatchDef,
     BCPatches,
+    DiscretisationDef,
     FluidVariables,
     HoldCurve,
+    IODef,
+    IOProfile,
     IsotropicExponentialMaterial,
     LoadingCurveDef,
     LoadingDef,
     LoadingSpaceDef,
     MaterialDef,
+    MatrixCalculation,
     MeshDef,
     NeoHookeanMaterial,
     ParabolicJet,
     ProblemDef,
     ProblemTopology,
     RampCurve,
+    RestartPoint,
     SineCurve,
     SolidVariables,
+    SolverDef,
+    SweepDef,
+    SweepValue,
     TimeDef,
     TopDef,
 )
@@ -23,21 +31,29 @@ from ._data import (
 __all__ = [
     "BCPatchDef",
     "BCPatches",
+    "DiscretisationDef",
     "FluidVariables",
     "HoldCurve",
+    "IODef",
+    "IOProfile",
     "IsotropicExponentialMaterial",
     "LoadingCurveDef",
     "LoadingDef",
     "LoadingSpaceDef",
     "MaterialDef",
+    "MatrixCalculation",
     "MeshDef",
     "NeoHookeanMaterial",
     "ParabolicJet",
     "ProblemDef",
     "ProblemTopology",
     "RampCurve",
+    "RestartPoint",
     "SineCurve",
     "SolidVariables",
+    "SolverDef",
+    "SweepDef",
+    "SweepValue",
     "TimeDef",
     "TopDef",
 ]
@@ -4,6 +4,8 @@
 from pathlib import Path
 from typing import TYPE_CHECKING
 
+from code_pkg.io import SweepSpec
+
 if TYPE_CHECKING:
     from code_pkg.types import ProblemDef, TopDef
 
@@ -121,31 +123,28 @@ FOUR_NEO_PULSE: list[ProblemDef] = [
 ]
 
 
-NEO_PULSE: dict[int, dict[int, dict[int, ProblemDef]]] = {
-    w: {
-        f: {
-            k: {
-                "prefix": f"pulse-neo-{f}Hz-{w}mm_{k}kPa",
-                "output_dir": Path("results"),
-                "time": {"start": 1, "end": 1000, "step": 0.001},
-                "mesh": DEFAULT_MESH,
-                "loading": {
-                    "time": [
-                        {
-                            "type": "Sine",
-                            "max_vel": f * 100.0 * 15 / w,
-                            "period": 1.0 / f,
-                            "cycles": 2,
-                        },
-                        {"type": "Hold", "duration": 1.0 - 1.0 / f},
-                    ],
-                    "space": {"type": "parabolic", "width": float(w)},
-                },
-                "material": {"type": "NeoHookean", "k": (k * 1000,)},
-            }
-            for k in [5, 10, 20, 30, 40, 50, 1000]
-        }
-        for f in [2, 4, 8]
-    }
-    for w in [5, 15]
-}
+NEO_PULSE = SweepSpec({
+    "base": {
+        "prefix": "pulse-neo",
+        "output_dir": Path("results"),
+        "time": {"start": 1, "end": 1000, "step": 0.001},
+        "mesh": DEFAULT_MESH,
+        "loading": {
+            "time": [
+                {"type": "Sine", "max_vel": 200.0, "period": 0.5, "cycles": 2},
+                {"type": "Hold", "duration": 0.5},
+            ],
+            "space": {"type": "parabolic", "width": 15.0},
+        },
+        "material": {"type": "NeoHookean", "k": (30000,)},
+    },
+    "prefix": "pulse-neo-{f}Hz-{w}mm_{k}kPa",
+    "axes": [{"w": [5, 15]}, {"f": [2, 4, 8]}, {"k": [5, 10, 20, 30, 40, 50, 1000]}],
+    "fields": {
+        "loading.time.0.max_vel": "f * 100.0 * 15 / w",
+        "loading.time.0.period": "1.0 / f",
+        "loading.time.1.duration": "1.0 - 1.0 / f",
+        "loading.space.width": "float(w)",
+        "material.k.0": "k * 1000",
+    },
+})
@@ -1,27 +1,81 @@
+from pathlib import Path
+
 from code_pkg import run
-from code_pkg.io import iter_problem_defs
+from code_pkg.api import (
+    CoreScheduler,
+    JobStore,
+    LogMonitor,
+    adaptive_sweep,
+    autotune_solver,
+    benchmark_discretisation,
+    run_sweep,
+)
+from code_pkg.plotting import SummaryPipeline, references_first
 from pytools.logging import get_logger
-from pytools.parallel import ThreadedRunner
-from pytools.path import iter_unpack
+from pytools.result import Err, Ok
 
 from examples import NEO_PULSE, TEST
-from summarize import summarize
+from summarize import summarize_group
+
+CORES_PER_JOB = 4
+CHECKPOINT_EVERY = 100
+
+
+def main(cores: int | None = None) -> None:
+    groups = list(NEO_PULSE.groups())
+    with (
+        SummaryPipeline(groups, on_group=summarize_group) as pipeline,
+        JobStore(Path("results") / "jobs.sqlite") as store,
+        CoreScheduler(cores=cores) as scheduler,
+    ):
+        summary = run_sweep(
+            references_first(groups),
+            store,
+            scheduler,
+            cores=CORES_PER_JOB,
+            on_done=pipeline.complete,
+            checkpoint=CHECKPOINT_EVERY,
+            monitor=LogMonitor(),
+        )
+    print(summary)
+    print(scheduler.report())
 
 
-def main() -> None:
-    with ThreadedRunner(thread=6) as runner:
-        for p in iter_problem_defs(NEO_PULSE):
-            print(f">>> Submitted {p['prefix']}...")
-            runner.submit(run, p)
-    for pset in iter_unpack(NEO_PULSE):
-        summarize(pset.values())
+def main_adaptive(budget: int = 20, cores: int | None = None) -> None:
+    with (
+        JobStore(Path("results") / "jobs.sqlite") as store,
+        CoreScheduler(cores=cores) as scheduler,
+    ):
+        report = adaptive_sweep(
+            NEO_PULSE, store, scheduler, budget=budget, batch=2, cores=CORES_PER_JOB
+        )
+    print(report)
 
 
 def main_pilot() -> None:
     run(TEST)
 
 
+def main_benchmark() -> None:
+    match benchmark_discretisation(TEST, cores=CORES_PER_JOB):
+        case Ok(report):
+            print(report)
+        case Err(e):
+            print(e)
+
+
+def main_autotune() -> None:
+    match autotune_solver(TEST, cores=CORES_PER_JOB):
+        case Ok(report):
+            print(report)
+        case Err(e):
+            print(e)
+
+
 if __name__ == "__main__":
     get_logger(level="INFO")
     # main_pilot()
+    # main_benchmark()
+    # main_autotune()
+    # main_adaptive()
     main()
@@ -3,7 +3,9 @@
 # ///
 
 
-from typing import TYPE_CHECKING
+import io
+import threading
+from typing import TYPE_CHECKING, NamedTuple, TypedDict, Unpack
 
 from cheartpy.fe.api import (
     PFile,
@@ -13,48 +15,173 @@ from cheartpy.fe.api import (
     create_time_scheme,
 )
 from code_pkg.components import (
+    DEFAULT_DISCRETISATION,
+    create_ale_bcpatches,
     create_ale_problem,
-    create_bcpatches,
+    create_fluid_bcpatches,
     create_fluid_problem,
     create_fluid_variables,
     create_interface_coupling_problem,
     create_pressure_calculation,
     create_problem_topology,
+    create_solid_bcpatches,
     create_solid_problem,
     create_solid_variables,
+    resolve_io,
 )
+from code_pkg.io import hash_def
+from code_pkg.types import SolverDef
 
 if TYPE_CHECKING:
-    from code_pkg.types import ProblemDef
+    from cheartpy.fe.physics.fluids import ALEElementDependentStiffness
+    from cheartpy.fe.physics.fs_coupling import FSCouplingProblem
+    from cheartpy.fe.physics.norm_calculation import NormProblem
+    from code_pkg.types import (
+        DiscretisationDef,
+        FluidVariables,
+        IODef,
+        ProblemDef,
+        ProblemTopology,
+        RestartPoint,
+        SolidVariables,
+        TopDef,
+    )
+
+DEFAULT_SOLVER = SolverDef(
+    matrix_calculation="EVALUATE_EVERY_BUILD",
+    ale_calculation="EVALUATE_EVERY_BUILD",
+    method="seq_fp_linesearch",
+    ale_first=False,
+    subiterations=12,
+    subiter_fraction=0.5,
+    l2tol=1.0e-8,
+    scale_first_residual=1000.0,
+)
+
+
+class _Kwargs(TypedDict, total=False):
+    checkpoint: int
+    restart: RestartPoint | None
+
+
+class _Skeleton(NamedTuple):
+    top: ProblemTopology
+    svars: SolidVariables
+    fvars: FluidVariables
+    ale: ALEElementDependentStiffness
+    coupling: FSCouplingProblem
+    pressure: tuple[NormProblem, NormProblem]
 
 
-def create_pfile(prob: ProblemDef) -> PFile:
-    time = create_time_scheme(
-        "Time", prob["time"]["start"], prob["time"]["end"], prob["time"]["step"]
+def _create_skeleton(
+    mesh: TopDef, dfn: DiscretisationDef, io: IODef, restart: RestartPoint | None
+) -> _Skeleton:
+    top = create_problem_topology(mesh, dfn)
+    svars = create_solid_variables(top, freq=io["freq"], fmt=io["fmt"], restart=restart)
+    fvars = create_fluid_variables(top, freq=io["freq"], fmt=io["fmt"], restart=restart)
+    binary = io["fmt"] == "BINARY"
+    ale_bc = create_ale_bcpatches(mesh, fvars)
+    return _Skeleton(
+        top,
+        svars,
+        fvars,
+        ale=create_ale_problem(top, fvars, 1.0, ale_bc, binary=binary, freq=io["freq"]),
+        coupling=create_interface_coupling_problem(
+            top, svars, fvars, binary=binary, freq=io["freq"]
+        ),
+        pressure=create_pressure_calculation(top, fvars),
     )
-    top = create_problem_topology(prob["mesh"])
-    svars = create_solid_variables(top)
-    fvars = create_fluid_variables(top)
-    bc = create_bcpatches(prob["mesh"], prob["loading"], svars, fvars)
-    solid = create_solid_problem(prob["material"], svars, bc.solid)
-    fluid = create_fluid_problem(top, fvars, 4e-3, bc.fluid)
-    ale = create_ale_problem(top, fvars, 1.0, bc.ale)
-    coupling = create_interface_coupling_problem(top, svars, fvars)
-    solve_matrix = create_solver_matrix("MainMatrix", "SOLVER_MUMPS", fluid, solid, coupling)
-    solve_matrix.add_setting("SolverMatrixCalculation", "EVALUATE_EVERY_BUILD")
-    ale_matrix = create_solver_matrix("ALEMatrix", "SOLVER_MUMPS", ale)
-    ale_matrix.add_setting("SolverMatrixCalculation", "EVALUATE_EVERY_BUILD")
-    apex_p, inlet_p = create_pressure_calculation(top, fvars)
-    sg = create_solver_subgroup("seq_fp_linesearch", solve_matrix, ale_matrix)
-    sg.scale_first_residual = 1000.0
+
+
+def _resolve_io(prob: ProblemDef, **kwargs: Unpack[_Kwargs]) -> IODef:
+    return resolve_io(prob.get("io"), kwargs.get("checkpoint", -1))
+
+
+def resolve_solver(prob: ProblemDef) -> SolverDef:
+    """Return the solver settings of `prob`, `DEFAULT_SOLVER` overridden by `prob["solver"]`.
+
+    Returns
+    -------
+    SolverDef
+        Every setting of `DEFAULT_SOLVER`.
+
+    """
+    return DEFAULT_SOLVER | prob.get("solver", {})
+
+
+def _assemble(prob: ProblemDef, skel: _Skeleton, **kwargs: Unpack[_Kwargs]) -> PFile:
+    restart = kwargs.get("restart")
+    start = prob["time"]["start"] if restart is None else restart.step + 1
+    time = create_time_scheme("Time", start, prob["time"]["end"], prob["time"]["step"])
+    top, svars, fvars = skel.top, skel.svars, skel.fvars
+    fluid_bc = create_fluid_bcpatches(prob["mesh"], prob["loading"], fvars)
+    solid = create_solid_problem(
+        prob["material"], svars, create_solid_bcpatches(prob["mesh"], svars)
+    )
+    fluid = create_fluid_problem(top, fvars, 4e-3, fluid_bc)
+    solver = resolve_solver(prob)
+    solve_matrix = create_solver_matrix("MainMatrix", "SOLVER_MUMPS", fluid, solid, skel.coupling)
+    solve_matrix.add_setting("SolverMatrixCalculation", solver["matrix_calculation"])
+    ale_matrix = create_solver_matrix("ALEMatrix", "SOLVER_MUMPS", skel.ale)
+    ale_matrix.add_setting("SolverMatrixCalculation", solver["ale_calculation"])
+    apex_p, inlet_p = skel.pressure
+    matrices = (ale_matrix, solve_matrix) if solver["ale_first"] else (solve_matrix, ale_matrix)
+    sg = create_solver_subgroup(solver["method"], *matrices)
+    sg.scale_first_residual = solver["scale_first_residual"]
     pres_sg = [create_solver_subgroup("seq_fp", apex_p), create_solver_subgroup("seq_fp", inlet_p)]
     g = create_solver_group("Main", time)
     g.add_solversubgroup(sg, *pres_sg)
-    g.set_iteration("SUBITERATION", 12)
-    g.set_iteration("SUBITERFRACTION", 0.5)
-    g.set_convergence("L2TOL", 1.0e-8)
+    g.set_iteration("SUBITERATION", solver["subiterations"])
+    g.set_iteration("SUBITERFRACTION", solver["subiter_fraction"])
+    g.set_convergence("L2TOL", solver["l2tol"])
     p = PFile()
     p.add_solvergroup(g)
     p.add_interface(*top.interfaces.values())
     p.set_outputpath(prob["output_dir"] / prob["prefix"])
     return p
+
+
+def create_pfile(prob: ProblemDef, **kwargs: Unpack[_Kwargs]) -> PFile:
+    dfn = prob.get("discretisation", DEFAULT_DISCRETISATION)
+    skel = _create_skeleton(prob["mesh"], dfn, _resolve_io(prob, **kwargs), kwargs.get("restart"))
+    return _assemble(prob, skel, **kwargs)
+
+
+class PFileBuilder:
+    """Build the PFiles of a sweep, reusing the parts shared by problems on the same mesh.
+
+    Topology, variables, ALE, interface coupling and pressure calculations depend only on the
+    mesh, discretisation and resolved IO settings and are built once per combination; only the
+    time scheme, loading and material parts are created per problem. Skeletons are not reused
+    for restarts, whose state variables read problem-specific data. Objects are shared, so
+    building and writing is serialised by a lock.
+    """
+
+    __slots__ = ("_lock", "_skeletons")
+
+    def __init__(self) -> None:
+        self._skeletons: dict[str, _Skeleton] = {}
+        self._lock = threading.Lock()
+
+    def _skeleton(self, prob: ProblemDef, **kwargs: Unpack[_Kwargs]) -> _Skeleton:
+        dfn = prob.get("discretisation", DEFAULT_DISCRETISATION)
+        io, restart = _resolve_io(prob, **kwargs), kwargs.get("restart")
+        if restart is not None:
+            return _create_skeleton(prob["mesh"], dfn, io, restart)
+        key = hash_def({"mesh": prob["mesh"], "discretisation": dfn, "io": io})
+        if (skel := self._skeletons.get(key)) is None:
+            skel = self._skeletons[key] = _create_skeleton(prob["mesh"], dfn, io, None)
+        return skel
+
+    def render(self, prob: ProblemDef, **kwargs: Unpack[_Kwargs]) -> str:
+        """Return the PFile of `prob` as text.
+
+        Returns
+        -------
+        str
+            Same content as writing `create_pfile(prob, **kwargs)`.
+
+        """
+        with self._lock, io.StringIO() as f:
+            _assemble(prob, self._skeleton(prob, **kwargs), **kwargs).write(f)
+            return f.getvalue()
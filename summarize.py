@@ -1,32 +1,72 @@
 from typing import TYPE_CHECKING
 
-from code_pkg.io import is_problem_def
+from code_pkg.io import walk_problem_defs
 from code_pkg.plotting import (
-    summarize_pressure_diff,
+    RenderReport,
+    pressure_diff_all_figure,
+    pressure_diff_figure,
+    pressure_oscillations_normalized_figure,
+    render_figures,
     summarize_pressure_diff_all,
     summarize_pressure_oscillations_normalized,
 )
+from pytools.result import Err, Ok
 
 from examples import NEO_PULSE
 
 if TYPE_CHECKING:
     from collections.abc import Iterable
 
+    from code_pkg.io import SweepStore, TreePath
+    from code_pkg.plotting import Downsample
     from code_pkg.types import ProblemDef
+    from pytools.plotting.trait import PlotKwargs
 
+GROUP_PLOT_KWARGS: PlotKwargs = {"padbottom": 0.3}
 
-def summarize(probs: Iterable[ProblemDef]) -> None:
-    for p in probs:
-        summarize_pressure_diff(p)
-    summarize_pressure_diff_all(probs, padbottom=0.3)
-    summarize_pressure_oscillations_normalized(probs, padbottom=0.3)
+
+def summarize_group(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = "minmax",
+) -> None:
+    summarize_pressure_diff_all(probs, store=store, downsample=downsample, **GROUP_PLOT_KWARGS)
+    summarize_pressure_oscillations_normalized(
+        probs, store=store, downsample=downsample, **GROUP_PLOT_KWARGS
+    )
+
+
+def summarize(
+    probs: Iterable[ProblemDef],
+    *,
+    store: SweepStore | None = None,
+    downsample: Downsample | None = "minmax",
+    workers: int | None = None,
+) -> RenderReport:
+    probs = list(probs)
+    figures = [pressure_diff_figure(p, store=store, downsample=downsample) for p in probs]
+    figures.extend((
+        pressure_diff_all_figure(probs, store=store, downsample=downsample, **GROUP_PLOT_KWARGS),
+        pressure_oscillations_normalized_figure(
+            probs, store=store, downsample=downsample, **GROUP_PLOT_KWARGS
+        ),
+    ))
+    jobs = []
+    for fig in figures:
+        match fig:
+            case Ok(job):
+                jobs.append(job)
+            case Err(e):
+                print(e)
+    report = render_figures(jobs, workers=workers)
+    print(report)
+    return report
 
 
 if __name__ == "__main__":
-    print(is_problem_def(NEO_PULSE))
-    for k, v in NEO_PULSE.items():
-        print(f"{k}: {is_problem_def(v)}")
-        for kk, vv in v.items():
-            print(f"  {kk}: {is_problem_def(vv)}")
-            for kkk, vvv in vv.items():
-                print(f"    {kkk}: {is_problem_def(vvv)}")
+    errors: dict[TreePath, Exception] = {}
+    valid = sum(1 for _ in walk_problem_defs(NEO_PULSE, errors))
+    print(f"{valid} valid problems")
+    for path, err in errors.items():
+        print(f"  {'/'.join(map(str, path))}: {err}")